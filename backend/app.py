@@ -2,6 +2,7 @@ import os
 from flask import Flask, jsonify, request
 from controller.sentiment_controller import sentiment_routes
 from controller.stock_controller import stock_routes
+from utils.registry import ModelRegistry
 
 # Create directories for outputs
 os.makedirs('stock_charts', exist_ok=True)
@@ -11,6 +12,13 @@ os.makedirs('stock_data', exist_ok=True)
 # Initialize Flask app
 app = Flask(__name__)
 
+# Build one instance of each engine at import time, so a pre-fork server
+# (e.g. `gunicorn --preload app:app`) loads them once in the master and the
+# workers share the lexicon pages copy-on-write
+registry = ModelRegistry()
+registry.init_app(app)
+registry.freeze()
+
 # Register routes
 app.register_blueprint(sentiment_routes, url_prefix='/api/sentiment')
 app.register_blueprint(stock_routes, url_prefix='/api/stocks')
@@ -1,32 +1,44 @@
-import seaborn as sns
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import nltk
 from datetime import datetime, timedelta
 import time as time_module
 import random
-import yfinance as yf
 from concurrent.futures import ThreadPoolExecutor
 import os
-import matplotlib
+import json
+import requests
+from requests.adapters import HTTPAdapter
+import pandas as pd
+import numpy as np
+from bs4 import BeautifulSoup
+from utils.data_utils import DataUtils
 
 # Set a specific directory for NLTK data
 nltk_data_dir = os.path.join(os.path.expanduser('~'), 'nltk_data')
-os.makedirs(nltk_data_dir, exist_ok=True)
 nltk.data.path.append(nltk_data_dir)
-# Set matplotlib to use the 'Agg' backend (non-interactive)
-# This prevents the "main thread is not in main loop" error
-matplotlib.use('TkAgg')
 
 # Create directories for outputs
 os.makedirs('stock_charts', exist_ok=True)
 os.makedirs('reports', exist_ok=True)
 
-# Download VADER lexicon
-nltk.download('vader_lexicon', quiet=True, download_dir=nltk_data_dir)
+def ensure_vader_lexicon():
+    """Download the VADER lexicon only if it isn't already available locally"""
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        os.makedirs(nltk_data_dir, exist_ok=True)
+        nltk.download('vader_lexicon', quiet=True, download_dir=nltk_data_dir)
 
 class StockSentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, pool_size=10):
+        ensure_vader_lexicon()
         self.sia = SentimentIntensityAnalyzer()
+        # Reuse one keep-alive connection pool per host instead of reconnecting for every ticker
+        self.session = requests.Session()
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         # Add finance-specific terms to the lexicon to improve accuracy
         self.sia.lexicon.update({
             'bullish': 4.0, 'bearish': -3.0,
@@ -73,6 +85,9 @@ class StockSentimentAnalyzer:
     
     def get_top_101_stocks(self):
         """Get the list of top 101 stocks by market cap"""
+        # yfinance is slow to import, so it's only loaded once live market data is needed
+        import yfinance as yf
+        
         try:
             # Use yfinance to get S&P 501 components as a starting point
             sp501_url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
@@ -177,7 +192,7 @@ class StockSentimentAnalyzer:
             # Add a delay to avoid being blocked
             time_module.sleep(random.uniform(2, 2))
             
-            response = requests.get(url, headers=headers, timeout=11)
+            response = self.session.get(url, headers=headers, timeout=11)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -198,15 +213,14 @@ class StockSentimentAnalyzer:
                 date_str = ''
                 time_str = ''
                 
-                if len(date_cell) >= 2:
+                if len(date_cell) >= 1:
                     # Check if first element is a date or time
-                    if ':' in date_cell[1]:  # It's a time
-                        time_str = date_cell[1]
-                        date_str = datetime.now().strftime('%m/%d/%y')
+                    if ':' in date_cell[0]:  # It's a time; the date is carried over from the row above
+                        time_str = date_cell[0]
                     else:  # It's a date
-                        date_str = date_cell[1]
-                        if len(date_cell) >= 3:
-                            time_str = date_cell[2]
+                        date_str = date_cell[0]
+                        if len(date_cell) >= 2:
+                            time_str = date_cell[1]
                 
                 # Check if a tag exists before accessing it
                 headline = row.a.text.strip() if row.a else "No headline"
@@ -235,7 +249,7 @@ class StockSentimentAnalyzer:
             # Add a delay to avoid being blocked
             time_module.sleep(random.uniform(2, 2))
             
-            response = requests.get(url, headers=headers, timeout=11)
+            response = self.session.get(url, headers=headers, timeout=11)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -311,40 +325,8 @@ class StockSentimentAnalyzer:
         today = datetime.now()
         cutoff_date = today - timedelta(days=days_back)
         
-        # Clean date formats and filter by recency
-        def parse_date(row):
-            try:
-                if row['date'] == '' or (isinstance(row['date'], str) and 'ago' in row['date'].lower()):
-                    return today
-                
-                if isinstance(row['date'], str) and '/' in row['date']:
-                    parts = row['date'].split('/')
-                    if len(parts) == 4:
-                        month, day, year = parts
-                        if len(year) == 3:
-                            year = '21' + year
-                        return datetime(int(year), int(month), int(day))
-                elif isinstance(row['date'], str) and '-' in row['date']:
-                    try:
-                        return datetime.strptime(row['date'], '%b-%d-%y')
-                    except:
-                        try:
-                            return datetime.strptime(row['date'], '%Y-%m-%d')
-                        except:
-                            return today
-                else:
-                    # For relative dates
-                    if isinstance(row['date'], str) and row['date'].lower() == 'today':
-                        return today
-                    elif isinstance(row['date'], str) and row['date'].lower() == 'yesterday':
-                        return today - timedelta(days=2)
-                    else:
-                        return today
-            except Exception as e:
-                print(f"Date parsing error: {e} for date: {row['date']}")
-                return today
-        
-        news_df['parsed_date'] = news_df.apply(parse_date, axis=2)
+        # Normalize every date format in one vectorized pass and filter by recency
+        news_df['parsed_date'] = DataUtils.normalize_news_dates(news_df, today)
         filtered_df = news_df[news_df['parsed_date'] >= cutoff_date]
         
         # If we have no news after filtering, use all available news
@@ -389,6 +371,8 @@ class StockSentimentAnalyzer:
     
     def get_stock_price_data(self, ticker, days=91):
         """Get historical stock price data using yfinance"""
+        import yfinance as yf
+        
         try:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
@@ -405,6 +389,32 @@ class StockSentimentAnalyzer:
             print(f"Error getting price data for {ticker}: {e}")
             return None
     
+    def get_bulk_price_data(self, tickers, days=91, chunk_size=50):
+        """Get closing prices for many tickers as a date x ticker matrix, one grouped download per chunk"""
+        import yfinance as yf
+        
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        
+        closes = []
+        for i in range(0, len(tickers), chunk_size):
+            chunk = tickers[i:i + chunk_size]
+            try:
+                data = yf.download(chunk, start=start_date, end=end_date, group_by='ticker',
+                                   auto_adjust=True, progress=False, threads=True)
+            except Exception as e:
+                print(f"Error downloading prices for {len(chunk)} tickers: {e}")
+                continue
+            
+            if isinstance(data.columns, pd.MultiIndex):
+                closes.append(data.xs('Close', axis=1, level=1))
+            elif not data.empty:
+                closes.append(data[['Close']].rename(columns={'Close': chunk[0]}))
+        
+        if not closes:
+            return pd.DataFrame()
+        return pd.concat(closes, axis=1).dropna(axis=1, how='all')
+    
     def predict_stock_trend(self, price_data, sentiment_score):
         """Generate a simple prediction based on historical prices and sentiment"""
         if price_data is None or len(price_data) < 6:
@@ -648,6 +658,9 @@ class StockSentimentAnalyzer:
         results = []
         stock_data_list = top_stocks.to_dict('records')
         
+        # Fetch every ticker's price history up front in a few grouped downloads
+        close_prices = self.get_bulk_price_data([stock['ticker'] for stock in stock_data_list])
+        
         for i, stock_data in enumerate(stock_data_list):
             try:
                 ticker = stock_data['ticker']
@@ -657,7 +670,7 @@ class StockSentimentAnalyzer:
                 
                 if sentiment_results:
                     # Get price data
-                    price_data = self.get_stock_price_data(ticker)
+                    price_data = close_prices[ticker].dropna().to_frame('Close') if ticker in close_prices else None
                     
                     if price_data is not None and not price_data.empty:
                         # Generate prediction
@@ -1,15 +1,56 @@
-from flask import Blueprint, jsonify, request
-from model.sentiment_model import SentimentModel
-from view.scraper_service import ScraperService
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from werkzeug.local import LocalProxy
+from datetime import datetime
+import json
 import pandas as pd
+from utils.data_utils import DataUtils
+from utils.registry import get_registry
 
-# Initialize sentiment model and scraper service
-sentiment_model = SentimentModel()
-scraper_service = ScraperService()
+# Shared sentiment model and scraper service owned by the app's registry
+sentiment_model = LocalProxy(lambda: get_registry().sentiment_model)
+scraper_service = LocalProxy(lambda: get_registry().scraper_service)
 
 # Create Blueprint for sentiment routes
 sentiment_routes = Blueprint('sentiment', __name__)
 
+# Largest number of texts accepted by one batch request
+MAX_BATCH_SIZE = 100000
+
+def read_batch_texts():
+    """Read texts from a JSON {'texts': [...]} or [...] body, or an NDJSON body (one string or {'text': ...} per line)
+
+    Raises ValueError for malformed input or non-string texts. At most MAX_BATCH_SIZE + 1
+    texts are read, so an oversized upload is cut off as soon as it exceeds the limit.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        texts = []
+        # Read line by line so a very large upload is never buffered as one string
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            texts.append(check_batch_text(item.get('text', '') if isinstance(item, dict) else item, len(texts)))
+            if len(texts) > MAX_BATCH_SIZE:
+                break
+        return texts
+    
+    data = request.get_json(silent=True)
+    # A bare JSON list is accepted as the texts themselves
+    texts = data.get('texts') if isinstance(data, dict) else data
+    if not isinstance(texts, list):
+        return None
+    texts = texts[:MAX_BATCH_SIZE + 1]
+    for i, text in enumerate(texts):
+        check_batch_text(text, i)
+    return texts
+
+def check_batch_text(text, index):
+    """Return text if it is a string, otherwise raise ValueError naming its position"""
+    if not isinstance(text, str):
+        raise ValueError(f'text {index} is {type(text).__name__}, expected a string')
+    return text
+
 @sentiment_routes.route('/analyze', methods=['POST'])
 def analyze_sentiment():
     """Analyze sentiment for a given text"""
@@ -27,6 +68,32 @@ def analyze_sentiment():
         'category': category
     })
 
+@sentiment_routes.route('/analyze-batch', methods=['POST'])
+def analyze_sentiment_batch():
+    """Analyze sentiment for a batch of texts, returning one array per score"""
+    try:
+        texts = read_batch_texts()
+    except ValueError as e:
+        return jsonify({'error': f'Invalid batch: {str(e)}'}), 400
+    
+    if texts is None:
+        return jsonify({'error': 'No texts provided'}), 400
+    
+    if len(texts) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'Too many texts, the limit is {MAX_BATCH_SIZE}'}), 413
+    
+    scores = sentiment_model.analyze_batch(texts)
+    categories = sentiment_model.categorize_batch(scores['compound'])
+    
+    return jsonify({
+        'count': len(texts),
+        'compound': scores['compound'].tolist(),
+        'pos': scores['pos'].tolist(),
+        'neu': scores['neu'].tolist(),
+        'neg': scores['neg'].tolist(),
+        'category': categories.tolist()
+    })
+
 @sentiment_routes.route('/analyze-ticker', methods=['GET'])
 def analyze_ticker_sentiment():
     """Analyze sentiment for a specific ticker"""
@@ -35,12 +102,20 @@ def analyze_ticker_sentiment():
     if not ticker:
         return jsonify({'error': 'No ticker provided'}), 400
     
-    # Get news from multiple sources
-    finviz_df = scraper_service.scrape_finviz_news(ticker)
-    yahoo_df = scraper_service.scrape_yahoo_finance_news(ticker)
+    # fields=avg_sentiment,news_details.headline keeps only the listed keys and news columns
+    top_fields, news_fields = DataUtils.parse_fields(request.args.get('fields'))
+    news_format = request.args.get('format', 'records')
+    if news_format not in NEWS_FORMATS:
+        return jsonify({'error': f'Unknown format: {news_format}'}), 400
+    
+    stream_format = request.args.get('stream')
+    if stream_format:
+        if stream_format not in STREAM_MIMETYPES:
+            return jsonify({'error': f'Unknown stream format: {stream_format}'}), 400
+        return stream_ticker_sentiment(ticker, stream_format, news_fields)
     
-    # Combine news from different sources
-    news_df = pd.concat([finviz_df, yahoo_df]).reset_index(drop=True)
+    # Get news from multiple sources concurrently
+    news_df = scraper_service.scrape_ticker_news(ticker)
     
     if news_df.empty:
         return jsonify({
@@ -53,9 +128,83 @@ def analyze_ticker_sentiment():
         }), 404
     
     # Analyze sentiment
-    sentiment_results = sentiment_model.analyze_ticker_news_sentiment(news_df)
+    include_details = top_fields is None or 'news_details' in top_fields
+    sentiment_results = sentiment_model.analyze_ticker_news_sentiment(
+        news_df, ticker=ticker, include_details=include_details,
+        news_fields=news_fields, news_format=news_format
+    )
+    if top_fields is not None:
+        sentiment_results = {key: value for key, value in sentiment_results.items() if key in top_fields}
     
     return jsonify({
         'ticker': ticker,
         'sentiment': sentiment_results
     })
+
+# Layouts for news_details: a list of row objects, or one array per column
+NEWS_FORMATS = ('records', 'columnar')
+
+# Streaming formats supported by /analyze-ticker?stream=...
+STREAM_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+def stream_ticker_sentiment(ticker, stream_format, news_fields=None):
+    """Stream each scored headline as its source arrives, followed by one aggregate record"""
+    def format_record(record):
+        line = json.dumps(record, default=DataUtils.json_default)
+        if stream_format == 'sse':
+            return f"event: {record['type']}\ndata: {line}\n\n"
+        return line + '\n'
+    
+    def generate():
+        now = datetime.now()
+        # Only the columns the aggregate needs are kept once a source's rows have been sent
+        scored_frames = []
+        for news_df in scraper_service.iter_ticker_news(ticker):
+            if news_df.empty:
+                continue
+            
+            scored_df = sentiment_model.score_news(news_df, ticker, now)
+            headline_df = scored_df[[field for field in news_fields if field in scored_df.columns]] if news_fields else scored_df
+            for record in headline_df.to_dict('records'):
+                yield format_record({'type': 'headline', 'ticker': ticker, **record})
+            scored_frames.append(scored_df[['compound', 'category', 'parsed_date']])
+        
+        news_df = pd.concat(scored_frames) if scored_frames else pd.DataFrame()
+        summary = sentiment_model.summarize_news_sentiment(news_df, now=now, include_details=False)
+        yield format_record({'type': 'aggregate', 'ticker': ticker, 'sentiment': summary})
+    
+    return Response(stream_with_context(generate()), mimetype=STREAM_MIMETYPES[stream_format])
+
+@sentiment_routes.route('/aggregate', methods=['GET'])
+def get_ticker_aggregate():
+    """Get the running time-decayed sentiment for a ticker without scraping"""
+    ticker = request.args.get('ticker')
+    
+    if not ticker:
+        return jsonify({'error': 'No ticker provided'}), 400
+    
+    aggregate = sentiment_model.get_ticker_aggregate(ticker)
+    if aggregate is None:
+        return jsonify({'error': f'No sentiment recorded for {ticker}'}), 404
+    
+    return jsonify({
+        'ticker': ticker,
+        'sentiment': aggregate
+    })
+
+@sentiment_routes.route('/sources', methods=['GET'])
+def get_source_health():
+    """Get the health of each news source"""
+    return jsonify({
+        'sources': scraper_service.get_source_health()
+    })
+
+@sentiment_routes.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Get hit/miss/eviction counters for the sentiment score cache"""
+    return jsonify({
+        'score_cache': sentiment_model.get_cache_stats()
+    })
@@ -1,17 +1,18 @@
 from flask import Blueprint, jsonify, request, send_from_directory
-from model.stock_model import StockModel
-from model.sentiment_model import SentimentModel
-from view.scraper_service import ScraperService
-from utils.data_utils import DataUtils
+from werkzeug.local import LocalProxy
+from utils.registry import get_registry
 import os
-import pandas as pd
 import json
 
-# Initialize models and services
-stock_model = StockModel()
-sentiment_model = SentimentModel()
-scraper_service = ScraperService()
-data_utils = DataUtils()
+# Shared models and services owned by the app's registry
+stock_model = LocalProxy(lambda: get_registry().stock_model)
+sentiment_model = LocalProxy(lambda: get_registry().sentiment_model)
+scraper_service = LocalProxy(lambda: get_registry().scraper_service)
+data_utils = LocalProxy(lambda: get_registry().data_utils)
+report_writer = LocalProxy(lambda: get_registry().report_writer)
+
+# Seconds a ticker's decayed sentiment aggregate is trusted before /predict scrapes news again
+AGGREGATE_MAX_AGE = 15 * 60
 
 # Create Blueprint for stock routes
 stock_routes = Blueprint('stocks', __name__)
@@ -61,6 +62,8 @@ def predict_stock():
     """Predict stock trend based on historical data and sentiment"""
     ticker = request.args.get('ticker')
     days = request.args.get('days', default=90, type=int)
+    # Fixes the simulation so the same inputs give the same bands
+    seed = request.args.get('seed', type=int)
     
     if not ticker:
         return jsonify({'error': 'No ticker provided'}), 400
@@ -71,16 +74,22 @@ def predict_stock():
     if price_data is None or price_data.empty:
         return jsonify({'error': f'No price data found for {ticker}'}), 404
     
-    # Get news and analyze sentiment
-    finviz_df = scraper_service.scrape_finviz_news(ticker)
-    yahoo_df = scraper_service.scrape_yahoo_finance_news(ticker)
-    news_df = pd.concat([finviz_df, yahoo_df]).reset_index(drop=True)
-    
-    sentiment_results = sentiment_model.analyze_ticker_news_sentiment(news_df)
-    avg_sentiment = sentiment_results['avg_sentiment']
+    # Use the running decayed sentiment if it is recent enough, otherwise scrape and score news
+    sentiment_results = sentiment_model.get_ticker_aggregate(ticker, max_age=AGGREGATE_MAX_AGE)
+    if sentiment_results is None:
+        news_df = scraper_service.scrape_ticker_news(ticker)
+        if not news_df.empty:
+            sentiment_model.score_news(news_df, ticker)
+        
+        # Read back the aggregate score_news just updated, so a fresh scrape and a recent
+        # aggregate give the same sentiment (and the same seeded prediction)
+        sentiment_results = sentiment_model.get_ticker_aggregate(ticker)
+    avg_sentiment = sentiment_results['avg_sentiment'] if sentiment_results else 0
     
     # Generate prediction
-    prediction_data = stock_model.predict_stock_trend(price_data, avg_sentiment)
+    # The rolling indicators cover the default window; an explicit days= is computed from that window
+    indicators = stock_model.get_stock_indicators(ticker) if 'days' not in request.args else None
+    prediction_data = stock_model.predict_stock_trend(price_data, avg_sentiment, seed, indicators)
     
     if prediction_data is None:
         return jsonify({'error': 'Could not generate prediction'}), 500
@@ -89,8 +98,8 @@ def predict_stock():
     prediction_dict = {
         'dates': [date.strftime('%Y-%m-%d') for date in prediction_data.index],
         'prices': prediction_data['Price'].tolist(),
-        'upper_bound': [price * 1.10 for price in prediction_data['Price'].tolist()],
-        'lower_bound': [price * 0.90 for price in prediction_data['Price'].tolist()]
+        'upper_bound': prediction_data['Upper'].tolist(),
+        'lower_bound': prediction_data['Lower'].tolist()
     }
     
     return jsonify({
@@ -113,52 +122,56 @@ def analyze_all_stocks():
     results = []
     stock_data_list = top_stocks.to_dict('records')
     
+    # Scrape news for every ticker and source concurrently up front
+    tickers = [stock['ticker'] for stock in stock_data_list]
+    news_by_ticker = scraper_service.scrape_news_many(tickers)
+    
+    # Closing prices for every ticker in a few grouped downloads, as a date x ticker matrix
+    close_prices = stock_model.get_bulk_price_data(tickers)
+    
     for stock_data in stock_data_list:
         ticker = stock_data['ticker']
         name = stock_data['name']
         
-        # Get news and analyze sentiment
-        finviz_df = scraper_service.scrape_finviz_news(ticker)
-        yahoo_df = scraper_service.scrape_yahoo_finance_news(ticker)
-        news_df = pd.concat([finviz_df, yahoo_df]).reset_index(drop=True)
+        # Analyze sentiment
+        news_df = news_by_ticker[ticker]
         
-        sentiment_results = sentiment_model.analyze_ticker_news_sentiment(news_df)
+        # Rankings only need the aggregates; per-headline details would bloat every row
+        sentiment_results = sentiment_model.analyze_ticker_news_sentiment(news_df, ticker=ticker, include_details=False)
         
         # Add ticker and name to results
         sentiment_results['ticker'] = ticker
         sentiment_results['name'] = name
         
-        # Get price data
-        price_data = stock_model.get_stock_price_data(ticker)
+        results.append(sentiment_results)
+    
+    # Generate predictions for the whole universe in one pass over the price matrix
+    sentiment_scores = {result['ticker']: result['avg_sentiment'] for result in results}
+    predictions = stock_model.predict_stock_trend_batch(close_prices, sentiment_scores)
+    
+    for sentiment_results in results:
+        ticker = sentiment_results['ticker']
+        prediction_data = stock_model.get_batch_prediction(predictions, ticker)
         
-        if price_data is not None and not price_data.empty:
-            # Generate prediction
-            prediction_data = stock_model.predict_stock_trend(
-                price_data, 
-                sentiment_results['avg_sentiment']
+        # Export data to JSON
+        if prediction_data is not None:
+            data_utils.export_stock_data_to_json(
+                ticker,
+                sentiment_results['name'],
+                close_prices[ticker].dropna().to_frame('Close'),
+                prediction_data,
+                sentiment_results['avg_sentiment'],
+                sentiment_results['investment_score']
             )
-            
-            # Export data to JSON
-            if prediction_data is not None:
-                data_utils.export_stock_data_to_json(
-                    ticker,
-                    name,
-                    price_data,
-                    prediction_data,
-                    sentiment_results['avg_sentiment'],
-                    sentiment_results['investment_score']
-                )
-        
-        results.append(sentiment_results)
     
-    # Rank stocks and create report
-    ranked_stocks = stock_model.rank_stocks_by_investment_potential(results)
-    data_utils.generate_master_stocks_json(ranked_stocks)
+    # Only the top 10 are returned; the full ranking, reports and master JSON are written in the background
+    top_stocks = stock_model.rank_stocks_by_investment_potential(results, top_k=10)
+    report_writer.submit(results)
     
     return jsonify({
         'message': 'Analysis complete',
         'stocks_analyzed': len(results),
-        'top_stocks': ranked_stocks.head(10).to_dict('records')
+        'top_stocks': top_stocks.to_dict('records')
     })
 
 @stock_routes.route('/data/<path:filename>', methods=['GET'])
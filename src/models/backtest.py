@@ -0,0 +1,115 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from model.prediction_engine import trend_inputs
+from model.price_store import PriceStore
+
+# Trading days ahead that forecasts are scored at
+DEFAULT_HORIZONS = (1, 5, 10, 20, 30)
+
+
+def load_closes_from_store(store, tickers=None, days=None):
+    """Build a date x ticker close matrix from the local price store, without any network access"""
+    if tickers is None:
+        if not os.path.isdir(store.price_dir):
+            return pd.DataFrame()
+        tickers = sorted(name[:-len('.npy')] for name in os.listdir(store.price_dir) if name.endswith('.npy'))
+    start_date = pd.Timestamp.now().normalize() - pd.Timedelta(days=days) if days else pd.Timestamp(0)
+
+    columns = {}
+    for ticker in tickers:
+        hist = store.get_frame(ticker, start_date.date())
+        if hist is not None:
+            columns[ticker] = hist['Close']
+    return pd.DataFrame(columns)
+
+
+def load_closes_from_fixture(path):
+    """Read a date x ticker close matrix from a CSV fixture (first column dates, one column per ticker)"""
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def walk_forward(closes, sentiment_scores=0.0, lookback=60, horizons=DEFAULT_HORIZONS, chunk_size=50):
+    """Replay the trend predictor over every rolling window of a (tickers x days) close matrix
+
+    Each window of lookback closes yields the predictor's daily change, and the forecast
+    for h days ahead is last_close * (1 + daily_change) ** h, i.e. the simulated paths
+    without their noise. Forecasts are scored against the actual close h days later and
+    against a naive forecast of no change. sentiment_scores is one score per ticker (or
+    one for all), since there is no history of past sentiment to replay.
+
+    Returns a DataFrame indexed by horizon with MAE, MAPE, RMSE and directional accuracy.
+    """
+    closes = np.asarray(closes, dtype=float)
+    n_tickers, n_days = closes.shape
+    n_windows = n_days - lookback + 1
+    if n_windows <= max(horizons):
+        raise ValueError(f"Need more than {lookback + max(horizons) - 1} days of history, got {n_days}")
+    sentiment_scores = np.broadcast_to(np.asarray(sentiment_scores, dtype=float), (n_tickers,))
+
+    last_close = np.empty((n_tickers, n_windows))
+    daily_change = np.empty((n_tickers, n_windows))
+    valid = np.empty((n_tickers, n_windows), dtype=bool)
+    for start in range(0, n_tickers, chunk_size):
+        end = min(start + chunk_size, n_tickers)
+        # (tickers, windows, lookback) view over the closes; only this chunk is ever copied
+        windows = sliding_window_view(closes[start:end], lookback, axis=1).reshape(-1, lookback)
+        chunk_last, chunk_change, _, chunk_valid = trend_inputs(
+            windows, np.repeat(sentiment_scores[start:end], n_windows)
+        )
+        last_close[start:end] = chunk_last.reshape(end - start, n_windows)
+        daily_change[start:end] = chunk_change.reshape(end - start, n_windows)
+        valid[start:end] = chunk_valid.reshape(end - start, n_windows)
+
+    rows = []
+    for horizon in horizons:
+        scored = n_windows - horizon
+        last = last_close[:, :scored]
+        actual = closes[:, lookback - 1 + horizon:]
+        predicted = last * (1 + daily_change[:, :scored]) ** horizon
+        mask = valid[:, :scored] & np.isfinite(actual) & np.isfinite(predicted) & (actual != 0)
+
+        actual, last, predicted = actual[mask], last[mask], predicted[mask]
+        row = {'horizon': horizon, 'forecasts': int(mask.sum())}
+        for label, forecast in (('model', predicted), ('naive', last)):
+            errors = forecast - actual
+            row[f'{label}_mae'] = float(np.mean(np.abs(errors))) if len(errors) else np.nan
+            row[f'{label}_mape'] = float(np.mean(np.abs(errors / actual)) * 100) if len(errors) else np.nan
+            row[f'{label}_rmse'] = float(np.sqrt(np.mean(errors ** 2))) if len(errors) else np.nan
+        # The naive forecast never moves, so only the model has a direction to score
+        row['model_directional_accuracy'] = (
+            float(np.mean(np.sign(predicted - last) == np.sign(actual - last))) if len(actual) else np.nan
+        )
+        row['mae_skill'] = 1 - row['model_mae'] / row['naive_mae'] if row['naive_mae'] else np.nan
+        rows.append(row)
+
+    return pd.DataFrame(rows).set_index('horizon')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the trend predictor against a naive forecast")
+    parser.add_argument('--fixture', help="CSV of closes (dates x tickers) to use instead of the price store")
+    parser.add_argument('--price-dir', default='stock_data/prices', help="Local price store directory")
+    parser.add_argument('--tickers', nargs='*', help="Tickers to include (default: every ticker in the store)")
+    parser.add_argument('--days', type=int, help="Calendar days of history to use (default: all stored)")
+    parser.add_argument('--lookback', type=int, default=60, help="Closes fed to each prediction")
+    parser.add_argument('--sentiment', type=float, default=0.0, help="Sentiment score applied to every ticker")
+    args = parser.parse_args()
+
+    if args.fixture:
+        close_prices = load_closes_from_fixture(args.fixture)
+        if args.tickers:
+            close_prices = close_prices[args.tickers]
+    else:
+        close_prices = load_closes_from_store(PriceStore(args.price_dir), args.tickers, args.days)
+
+    if close_prices.empty:
+        raise SystemExit("No price data to backtest; fill the price store or pass --fixture")
+
+    results = walk_forward(close_prices.to_numpy(dtype=float).T, args.sentiment, args.lookback)
+    print(f"Backtested {close_prices.shape[1]} tickers over {close_prices.shape[0]} days")
+    print(results.to_string(float_format=lambda value: f'{value:.4f}'))
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import re
+import threading
+
+from utils.file_utils import atomic_write, safe_ticker_path
+
+
+def normalize_headline(headline):
+    """Lowercase a headline and collapse whitespace so trivial variations share a key"""
+    return re.sub(r'\s+', ' ', str(headline)).strip().lower()
+
+
+def headline_key(headline, source):
+    """Key a headline by the hash of its normalized text plus its source"""
+    digest = hashlib.sha1(normalize_headline(headline).encode('utf-8')).hexdigest()
+    return f'{digest}|{source}'
+
+
+class HeadlineIndex:
+    """Persistent per-ticker index of already-scored headlines"""
+
+    def __init__(self, index_dir='cache/headlines', lexicon_version=None, max_entries=2000):
+        self.index_dir = index_dir
+        # Scores from a different lexicon are discarded rather than reused
+        self.lexicon_version = lexicon_version
+        self.max_entries = max_entries
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def _path(self, ticker):
+        return safe_ticker_path(self.index_dir, ticker, 'json')
+
+    def _load(self, ticker):
+        # ticker is already upper-cased, so 'aapl' and 'AAPL' share one index and one file
+        index = self._indexes.get(ticker)
+        if index is not None:
+            return index
+
+        index = {}
+        try:
+            with open(self._path(ticker), 'r') as f:
+                data = json.load(f)
+            if data.get('lexicon_version') == self.lexicon_version:
+                index = data.get('headlines', {})
+        except (OSError, ValueError):
+            pass
+        self._indexes[ticker] = index
+        return index
+
+    def lookup(self, ticker, keys):
+        """Return {key: scores} for the keys already scored for a ticker"""
+        ticker = ticker.upper()
+        with self._lock:
+            index = self._load(ticker)
+            return {key: index[key] for key in keys if key in index}
+
+    def add(self, ticker, scored):
+        """Record {key: scores} for a ticker and persist the index"""
+        if not scored:
+            return
+        ticker = ticker.upper()
+        with self._lock:
+            index = self._load(ticker)
+            index.update(scored)
+            # Keep only the most recently added headlines
+            if len(index) > self.max_entries:
+                for key in list(index)[:len(index) - self.max_entries]:
+                    del index[key]
+            self._save(ticker, index)
+
+    def _save(self, ticker, index):
+        try:
+            with atomic_write(self._path(ticker)) as f:
+                json.dump({'lexicon_version': self.lexicon_version, 'headlines': index}, f)
+        except OSError as e:
+            print(f"Error saving headline index for {ticker}: {e}")
@@ -0,0 +1,210 @@
+import threading
+
+import numpy as np
+
+from model.prediction_engine import MIN_HISTORY
+from utils.file_utils import atomic_write, safe_ticker_path
+
+
+class RollingWindow:
+    """Fixed-size ring buffer keeping a running sum and sum of squares"""
+
+    def __init__(self, size, values=None, pos=0, count=0, total=0.0, total_sq=0.0):
+        self.size = size
+        self.values = np.zeros(size) if values is None else values
+        self.pos = int(pos)
+        self.count = int(count)
+        self.total = float(total)
+        self.total_sq = float(total_sq)
+
+    def push(self, value):
+        """Add a value, dropping the oldest once the window is full"""
+        if self.count == self.size:
+            old = self.values[self.pos]
+            self.total -= old
+            self.total_sq -= old * old
+        else:
+            self.count += 1
+        self.values[self.pos] = value
+        self.total += value
+        self.total_sq += value * value
+        self.pos = (self.pos + 1) % self.size
+
+    def replace_last(self, value):
+        """Overwrite the most recently pushed value"""
+        last = (self.pos - 1) % self.size
+        old = self.values[last]
+        self.total += value - old
+        self.total_sq += value * value - old * old
+        self.values[last] = value
+
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+    def std(self):
+        """Sample standard deviation, like pandas' std"""
+        if self.count < 2:
+            return np.nan
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+
+class TickerIndicators:
+    """Rolling moving averages and daily-return statistics for one ticker"""
+
+    def __init__(self, ma_windows, returns_window):
+        self.moving_averages = {window: RollingWindow(window) for window in ma_windows}
+        self.returns = RollingWindow(returns_window)
+        self.last_day = None
+        self.last_close = np.nan
+        self.prev_close = np.nan
+        self.bars = 0
+
+    def push_bar(self, day, close):
+        """Append a new bar in O(1)"""
+        if self.bars:
+            self.returns.push(close / self.last_close - 1)
+        for window in self.moving_averages.values():
+            window.push(close)
+        self.prev_close, self.last_close = self.last_close, close
+        self.last_day = int(day)
+        self.bars += 1
+
+    def revise_last_bar(self, close):
+        """Replace the latest bar's close, e.g. when a partial day is re-fetched"""
+        for window in self.moving_averages.values():
+            window.replace_last(close)
+        if self.bars > 1:
+            self.returns.replace_last(close / self.prev_close - 1)
+        self.last_close = close
+
+    def to_arrays(self):
+        arrays = {
+            'last_day': self.last_day,
+            'last_close': self.last_close,
+            'prev_close': self.prev_close,
+            'bars': self.bars
+        }
+        for name, window in self._windows():
+            arrays[f'{name}_values'] = window.values
+            arrays[f'{name}_state'] = [window.pos, window.count, window.total, window.total_sq]
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, ma_windows, returns_window):
+        indicators = cls(ma_windows, returns_window)
+        indicators.last_day = int(arrays['last_day'])
+        indicators.last_close = float(arrays['last_close'])
+        indicators.prev_close = float(arrays['prev_close'])
+        indicators.bars = int(arrays['bars'])
+        for size in ma_windows:
+            indicators.moving_averages[size] = cls._load_window(arrays, f'ma{size}', size)
+        indicators.returns = cls._load_window(arrays, 'returns', returns_window)
+        return indicators
+
+    @staticmethod
+    def _load_window(arrays, name, size):
+        values = np.array(arrays[f'{name}_values'])
+        if len(values) != size:
+            raise ValueError(f"Stored {name} window has {len(values)} values, expected {size}")
+        return RollingWindow(size, values, *arrays[f'{name}_state'])
+
+    def _windows(self):
+        yield from ((f'ma{size}', window) for size, window in self.moving_averages.items())
+        yield 'returns', self.returns
+
+
+class IndicatorEngine:
+    """Per-ticker rolling indicator state, advanced with only the bars added since the last call
+
+    State is persisted as <TICKER>.indicators.npz next to the ticker's price file.
+    """
+
+    def __init__(self, state_dir='stock_data/prices', ma_windows=(10, 30), returns_window=61):
+        self.state_dir = state_dir
+        self.ma_windows = tuple(ma_windows)
+        # Number of daily returns averaged, about 90 calendar days of trading
+        self.returns_window = returns_window
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _path(self, ticker):
+        return safe_ticker_path(self.state_dir, ticker, 'indicators.npz')
+
+    def _load(self, ticker):
+        state = self._states.get(ticker)
+        if state is not None:
+            return state
+        try:
+            with np.load(self._path(ticker)) as arrays:
+                state = TickerIndicators.from_arrays(arrays, self.ma_windows, self.returns_window)
+        except (OSError, ValueError, KeyError):
+            # Missing, unreadable or built with different windows: rebuilt from the prices
+            state = None
+        self._states[ticker] = state
+        return state
+
+    def update(self, ticker, days, closes):
+        """Bring a ticker's indicators up to date with its stored bars and return a snapshot
+
+        days and closes are the full stored series (e.g. rows of the memory-mapped price
+        matrix); only bars after the last one seen are read. Returns None if the ticker
+        has fewer than MIN_HISTORY bars.
+        """
+        if len(days) == 0:
+            return None
+
+        # One state per ticker regardless of case, matching the file name
+        ticker = ticker.upper()
+        with self._lock:
+            state = self._load(ticker)
+            changed = False
+
+            start = None
+            if state is not None and state.last_day is not None:
+                start = int(np.searchsorted(days, state.last_day))
+                if start == len(days) or days[start] != state.last_day:
+                    # The stored history no longer contains our last bar, so start over
+                    start = None
+                else:
+                    if closes[start] != state.last_close and np.isfinite(closes[start]):
+                        state.revise_last_bar(float(closes[start]))
+                        changed = True
+                    start += 1
+            if start is None:
+                # Only the longest window's worth of bars affects the state
+                start = max(0, len(days) - max(self.ma_windows + (self.returns_window + 1,)))
+                state = TickerIndicators(self.ma_windows, self.returns_window)
+                self._states[ticker] = state
+
+            for day, close in zip(days[start:], closes[start:]):
+                if np.isnan(close):
+                    continue
+                state.push_bar(day, float(close))
+                changed = True
+
+            if changed:
+                self._save(ticker, state)
+            return self.snapshot(state)
+
+    def snapshot(self, state):
+        """Return the indicator values the trend predictor needs"""
+        if state.bars < MIN_HISTORY:
+            return None
+        short_window, long_window = self.ma_windows[0], self.ma_windows[-1]
+        return {
+            'last_day': np.datetime64(state.last_day, 'D'),
+            'last_close': state.last_close,
+            'short_ma': state.moving_averages[short_window].mean(),
+            'long_ma': state.moving_averages[long_window].mean(),
+            'avg_daily_change': state.returns.mean(),
+            'volatility': state.returns.std(),
+            'bars': state.bars
+        }
+
+    def _save(self, ticker, state):
+        try:
+            with atomic_write(self._path(ticker), 'wb') as f:
+                np.savez(f, **state.to_arrays())
+        except OSError as e:
+            print(f"Error saving indicators for {ticker}: {e}")
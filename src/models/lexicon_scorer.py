@@ -0,0 +1,190 @@
+import math
+import string
+import time
+
+import numpy as np
+
+SCORE_FIELDS = ('neg', 'neu', 'pos', 'compound')
+
+
+class CompiledLexiconScorer:
+    """Fast VADER-compatible scorer over a precompiled lexicon, including multi-word phrases
+
+    Implements VADER's lexicon lookup, capitalisation emphasis, booster words, negation,
+    "but" weighting and punctuation emphasis. The rarer idiom and "never so"/"least"
+    rules are not applied, so scores agree with NLTK VADER within a small tolerance
+    rather than exactly.
+    """
+
+    def __init__(self, lexicon):
+        # Imported here so importing this module (and sentiment_model) doesn't load NLTK
+        from nltk.sentiment.vader import VaderConstants
+
+        constants = VaderConstants()
+        self.c_incr = constants.C_INCR
+        self.n_scalar = constants.N_SCALAR
+        self.boosters = {word.lower(): value for word, value in constants.BOOSTER_DICT.items()}
+        self.negations = {word.lower() for word in constants.NEGATE}
+
+        # Single words go into a flat dict; phrases are indexed by their first word,
+        # longest first, so a headline is matched in one left-to-right pass
+        self.words = {}
+        self.phrases = {}
+        for entry, valence in lexicon.items():
+            tokens = tuple(entry.lower().split())
+            if len(tokens) == 1:
+                self.words[tokens[0]] = valence
+            elif len(tokens) > 1:
+                self.phrases.setdefault(tokens[0], []).append((tokens[1:], valence))
+        for candidates in self.phrases.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    def tokenize(self, text):
+        """Split text into VADER-style tokens, stripping surrounding punctuation from words
+
+        Mirrors VADER's _strip_punc_if_word: a token keeps its punctuation only when
+        stripping it would leave two characters or fewer, which preserves emoticons
+        such as ":)" and short tokens like "A." while "strong!!!" becomes "strong".
+        """
+        tokens = []
+        for token in text.split():
+            if len(token) <= 1:
+                continue
+            stripped = token.strip(string.punctuation)
+            tokens.append(token if len(stripped) <= 2 else stripped)
+        return tokens
+
+    def _valences(self, tokens):
+        lowered = [token.lower() for token in tokens]
+        n_caps = sum(1 for token in tokens if token.isupper())
+        is_cap_diff = 0 < n_caps < len(tokens)
+        words = self.words
+        boosters = self.boosters
+
+        valences = [0.0] * len(tokens)
+        i = 0
+        while i < len(tokens):
+            word = lowered[i]
+            span = 1
+            valence = None
+
+            for rest, phrase_valence in self.phrases.get(word, ()):
+                if tuple(lowered[i + 1:i + 1 + len(rest)]) == rest:
+                    valence = phrase_valence
+                    span = 1 + len(rest)
+                    break
+            if valence is None:
+                if word in boosters or (word == 'kind' and i + 1 < len(tokens) and lowered[i + 1] == 'of'):
+                    i += 1
+                    continue
+                valence = words.get(word)
+            if valence is None:
+                i += 1
+                continue
+
+            if is_cap_diff and tokens[i].isupper():
+                valence += self.c_incr if valence > 0 else -self.c_incr
+
+            # Boosters and negations in the three preceding words, with decaying weight
+            for distance, decay in ((1, 1.0), (2, 0.95), (3, 0.9)):
+                j = i - distance
+                if j < 0:
+                    break
+                previous = lowered[j]
+                if previous in words:
+                    continue
+                if previous in boosters:
+                    scalar = boosters[previous]
+                    if valence < 0:
+                        scalar = -scalar
+                    if is_cap_diff and tokens[j].isupper():
+                        scalar += self.c_incr if valence > 0 else -self.c_incr
+                    valence += scalar * decay
+                if previous in self.negations or "n't" in previous:
+                    valence *= self.n_scalar
+
+            valences[i] = valence
+            i += span
+
+        # Words before "but" count for half, words after it for one and a half
+        if 'but' in lowered:
+            but_index = lowered.index('but')
+            for k in range(len(valences)):
+                if k < but_index:
+                    valences[k] *= 0.5
+                elif k > but_index:
+                    valences[k] *= 1.5
+
+        return valences
+
+    def _punctuation_emphasis(self, text):
+        amplifier = min(text.count('!'), 4) * 0.292
+        question_marks = text.count('?')
+        if question_marks > 1:
+            amplifier += 0.96 if question_marks > 3 else question_marks * 0.18
+        return amplifier
+
+    def score(self, text):
+        """Return (neg, neu, pos, compound) for a single text"""
+        text = str(text)
+        valences = self._valences(self.tokenize(text))
+        if not valences:
+            return 0.0, 0.0, 0.0, 0.0
+
+        total = sum(valences)
+        amplifier = self._punctuation_emphasis(text)
+        if total > 0:
+            total += amplifier
+        elif total < 0:
+            total -= amplifier
+        compound = max(-1.0, min(1.0, total / math.sqrt(total * total + 15)))
+
+        pos_sum = sum(v + 1 for v in valences if v > 0)
+        neg_sum = sum(v - 1 for v in valences if v < 0)
+        neu_count = sum(1 for v in valences if v == 0)
+        if pos_sum > abs(neg_sum):
+            pos_sum += amplifier
+        elif pos_sum < abs(neg_sum):
+            neg_sum -= amplifier
+        weight = pos_sum + abs(neg_sum) + neu_count
+
+        return (
+            round(abs(neg_sum / weight), 3),
+            round(abs(neu_count / weight), 3),
+            round(abs(pos_sum / weight), 3),
+            round(compound, 4)
+        )
+
+    def polarity_scores(self, text):
+        """Score a single text, returning a dict shaped like VADER's polarity_scores"""
+        return dict(zip(SCORE_FIELDS, self.score(text)))
+
+    def score_batch(self, texts):
+        """Score many texts, returning columnar neg/neu/pos/compound arrays"""
+        matrix = np.array([self.score(text) for text in texts], dtype=float).reshape(-1, len(SCORE_FIELDS))
+        return {field: matrix[:, i] for i, field in enumerate(SCORE_FIELDS)}
+
+
+def compare_with_vader(scorer, analyzer, texts, tolerance=0.1):
+    """Benchmark the compiled scorer against a VADER analyzer and report compound-score agreement"""
+    texts = [str(text) for text in texts]
+
+    start = time.perf_counter()
+    compiled = scorer.score_batch(texts)['compound']
+    compiled_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = np.array([analyzer.polarity_scores(text)['compound'] for text in texts], dtype=float)
+    vader_seconds = time.perf_counter() - start
+
+    differences = np.abs(compiled - reference)
+    return {
+        'texts': len(texts),
+        'compiled_seconds': compiled_seconds,
+        'vader_seconds': vader_seconds,
+        'speedup': vader_seconds / compiled_seconds if compiled_seconds else float('inf'),
+        'max_difference': float(differences.max()) if len(texts) else 0.0,
+        'mean_difference': float(differences.mean()) if len(texts) else 0.0,
+        'agreement': float((differences <= tolerance).mean()) if len(texts) else 1.0,
+        'tolerance': tolerance
+    }
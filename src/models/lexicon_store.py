@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+
+from utils.file_utils import atomic_write
+
+# Finance-specific terms added to the VADER lexicon to improve accuracy
+FINANCE_LEXICON = {
+    'bullish': 3.0, 'bearish': -3.0,
+    'outperform': 2.0, 'underperform': -2.0,
+    'buy': 2.0, 'sell': -2.0,
+    'upgrade': 2.5, 'downgrade': -2.5,
+    'beat': 2.0, 'miss': -2.0,
+    'exceeded': 2.0, 'fell short': -2.0,
+    'growth': 1.5, 'decline': -1.5,
+    'profit': 1.5, 'loss': -1.5,
+    'positive': 1.0, 'negative': -1.0,
+    'strong': 1.0, 'weak': -1.0,
+    'surge': 2.0, 'plunge': -2.0,
+    'rise': 1.0, 'fall': -1.0,
+    'above': 1.0, 'below': -1.0,
+    'higher': 1.0, 'lower': -1.0,
+    'increase': 1.0, 'decrease': -1.0,
+    'gain': 1.0, 'lose': -1.0,
+    'success': 1.5, 'failure': -1.5,
+    'promising': 1.0, 'disappointing': -1.0,
+    'optimistic': 1.0, 'pessimistic': -1.0,
+    'opportunity': 1.0, 'risk': -0.5,
+    'recommend': 1.5, 'avoid': -1.5,
+    'dividend': 1.0, 'debt': -0.5,
+    'rally': 2.0, 'crash': -2.5,
+    'breakthrough': 2.0, 'breakdown': -2.0,
+    'outlook': 0.5, 'guidance': 0.5,
+    'target': 0.5, 'estimate': 0.5
+}
+
+# Identifies the scoring lexicon so cached scores are invalidated when it changes
+LEXICON_VERSION = hashlib.sha1(json.dumps(FINANCE_LEXICON, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+# Directory holding the pre-snapshotted finance-augmented lexicon; VESTRA_LEXICON_DIR overrides it.
+# The snapshot for the current LEXICON_VERSION is committed under data/; after changing
+# FINANCE_LEXICON, regenerate it with `python -m model.lexicon_store` and commit the new file
+LEXICON_DIR = os.environ.get('VESTRA_LEXICON_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+
+# With VESTRA_OFFLINE=1 the NLTK downloader is never used; a snapshot or local NLTK data must exist
+OFFLINE = os.environ.get('VESTRA_OFFLINE', '0') == '1'
+
+_nltk_lock = threading.Lock()
+
+def get_snapshot_path(lexicon_dir=None):
+    """Return the snapshot file for the current lexicon version"""
+    return os.path.join(lexicon_dir or LEXICON_DIR, f'finance_vader_lexicon-{LEXICON_VERSION}.txt')
+
+def snapshot_lexicon(lexicon, path=None):
+    """Write a lexicon in VADER's tab-separated format so it can be loaded without NLTK data"""
+    path = path or get_snapshot_path()
+    with atomic_write(path, encoding='utf-8') as f:
+        for word, valence in sorted(lexicon.items()):
+            f.write(f'{word}\t{valence}\n')
+    return path
+
+def load_snapshot(path=None):
+    """Read a snapshot written by snapshot_lexicon back into a {word: valence} dict"""
+    lexicon = {}
+    with open(path or get_snapshot_path(), 'r', encoding='utf-8') as f:
+        for line in f:
+            word, _, valence = line.rstrip('\n').partition('\t')
+            if word:
+                lexicon[word] = float(valence)
+    return lexicon
+
+def _ensure_vader_lexicon():
+    """Make the stock VADER lexicon available, downloading it only if allowed and missing"""
+    import nltk
+
+    # Set a specific directory for NLTK data
+    nltk_data_dir = os.path.join(os.path.expanduser('~'), 'nltk_data')
+    with _nltk_lock:
+        if nltk_data_dir not in nltk.data.path:
+            nltk.data.path.append(nltk_data_dir)
+        try:
+            nltk.data.find('sentiment/vader_lexicon.zip')
+        except LookupError:
+            if OFFLINE:
+                raise
+            os.makedirs(nltk_data_dir, exist_ok=True)
+            nltk.download('vader_lexicon', quiet=True, download_dir=nltk_data_dir)
+
+def build_analyzer(lexicon_dir=None):
+    """Create a VADER analyzer with the finance-specific terms added to its lexicon
+
+    Loads the local snapshot when there is one; otherwise builds from the NLTK lexicon
+    and writes the snapshot so the next start needs neither NLTK data nor the network.
+    """
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+    path = get_snapshot_path(lexicon_dir)
+    if os.path.exists(path):
+        # Bypass __init__, which would resolve the stock lexicon through nltk.data
+        sia = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+        sia.lexicon_file = None
+        sia.lexicon = load_snapshot(path)
+        sia.constants = VaderConstants()
+        return sia
+
+    _ensure_vader_lexicon()
+    sia = SentimentIntensityAnalyzer()
+    sia.lexicon.update(FINANCE_LEXICON)
+    try:
+        snapshot_lexicon(sia.lexicon, path)
+    except OSError as e:
+        print(f"Could not write lexicon snapshot to {path}: {e}")
+    return sia
+
+if __name__ == "__main__":
+    # Pre-build the snapshot (e.g. while building a deploy image) so workers start offline
+    print(f"Lexicon snapshot written to {snapshot_lexicon(build_analyzer().lexicon)}")
@@ -0,0 +1,134 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Daily noise used when there isn't enough history to measure volatility
+DEFAULT_VOLATILITY = 0.005
+
+# Fewest closes a series needs before it is forecast
+MIN_HISTORY = 5
+
+
+def forward_fill(matrix):
+    """Carry each row's last valid value over later NaNs; leading NaNs stay NaN"""
+    valid = ~np.isnan(matrix)
+    last_valid = np.where(valid, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(last_valid, axis=1, out=last_valid)
+    return np.take_along_axis(matrix, last_valid, axis=1)
+
+
+def trend_inputs(closes, sentiment_scores, short_window=10, long_window=30):
+    """Compute the forecast inputs for a (series x days) matrix of closes in single passes
+
+    Rows may start with NaNs where a series has less history; each series' moving
+    averages then cover the days it has, like a rolling window of min(window, len).
+    Returns last_close, daily_change, volatility and a mask of series with enough history.
+    """
+    closes = np.asarray(closes, dtype=float)
+    if closes.size == 0:
+        # No series or no days: nothing to forecast
+        empty = np.full(closes.shape[0], np.nan)
+        return empty, empty.copy(), np.full(closes.shape[0], DEFAULT_VOLATILITY), np.zeros(closes.shape[0], dtype=bool)
+    history = np.count_nonzero(~np.isnan(closes), axis=1)
+    closes = forward_fill(closes)
+    sentiment_scores = np.asarray(sentiment_scores, dtype=float)
+
+    # Rows without data are caught by the mask, so their empty-slice warnings are noise
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        short_ma = np.nanmean(closes[:, -short_window:], axis=1)
+        long_ma = np.nanmean(closes[:, -long_window:], axis=1)
+
+        daily_returns = closes[:, 1:] / closes[:, :-1] - 1
+        avg_daily_change = np.nanmean(daily_returns, axis=1)
+        volatility = np.nanstd(daily_returns, axis=1, ddof=1)
+
+    daily_change = blend_daily_change(short_ma, long_ma, avg_daily_change, sentiment_scores)
+    return closes[:, -1], daily_change, usable_volatility(volatility), history >= MIN_HISTORY
+
+
+def blend_daily_change(short_ma, long_ma, avg_daily_change, sentiment_scores):
+    """Blend momentum, average daily change and sentiment into the forecast's daily change"""
+    # Momentum compares recent vs longer-term average; sentiment scales -1..1 into a 0.9..1.1 multiplier
+    momentum = np.asarray(short_ma, dtype=float) / long_ma - 1
+    return (avg_daily_change + momentum / 10) * (1 + np.asarray(sentiment_scores, dtype=float) / 10)
+
+
+def usable_volatility(volatility):
+    """Replace missing or zero volatilities with DEFAULT_VOLATILITY"""
+    volatility = np.asarray(volatility, dtype=float)
+    return np.where(np.isfinite(volatility) & (volatility > 0), volatility, DEFAULT_VOLATILITY)
+
+
+class MonteCarloEngine:
+    """Simulates many price paths at once and summarizes them as a median forecast with quantile bands"""
+
+    def __init__(self, n_paths=2000, horizon=30, quantiles=(0.05, 0.95), seed=None):
+        self.n_paths = n_paths
+        self.horizon = horizon
+        self.lower_quantile, self.upper_quantile = quantiles
+        self.seed = seed
+
+    def simulate(self, last_close, daily_change, volatility, rng=None):
+        """Simulate paths for k series at once, returning a (k, n_paths, horizon) array
+
+        Day 0 of every path is the last close; each later day compounds the series'
+        daily change with independent normal noise of the series' volatility.
+        """
+        rng = rng if rng is not None else np.random.default_rng(self.seed)
+        last_close = np.asarray(last_close, dtype=float).reshape(-1, 1, 1)
+        daily_change = np.asarray(daily_change, dtype=float).reshape(-1, 1, 1)
+        volatility = np.asarray(volatility, dtype=float).reshape(-1, 1, 1)
+
+        # Built in place to avoid allocating a temporary for each step of the formula
+        growth = rng.standard_normal((last_close.shape[0], self.n_paths, self.horizon - 1))
+        growth *= volatility
+        growth += 1
+        growth *= 1 + daily_change
+
+        paths = np.empty((last_close.shape[0], self.n_paths, self.horizon))
+        paths[:, :, 0] = 1.0
+        np.cumprod(growth, axis=2, out=paths[:, :, 1:])
+        paths *= last_close
+        return paths
+
+    def summarize(self, paths):
+        """Reduce simulated paths to (median, lower, upper) arrays of shape (k, horizon)"""
+        lower, median, upper = np.quantile(paths, [self.lower_quantile, 0.5, self.upper_quantile], axis=1)
+        return median, lower, upper
+
+    def forecast_batch(self, last_close, daily_change, volatility, seed=None, chunk_size=50):
+        """Forecast k series at once, returning (median, lower, upper) arrays of shape (k, horizon)
+
+        Series are simulated chunk_size at a time so memory stays at
+        chunk_size x n_paths x horizon regardless of how many series there are.
+        """
+        rng = np.random.default_rng(self.seed if seed is None else seed)
+        last_close = np.asarray(last_close, dtype=float)
+        bands = np.empty((3, len(last_close), self.horizon))
+        for start in range(0, len(last_close), chunk_size):
+            end = start + chunk_size
+            paths = self.simulate(last_close[start:end], daily_change[start:end], volatility[start:end], rng)
+            bands[:, start:end] = self.summarize(paths)
+        return bands[0], bands[1], bands[2]
+
+    def forecast_dates(self, last_date):
+        """Return the dates covered by a forecast starting the day after last_date"""
+        return pd.date_range(start=last_date + pd.Timedelta(days=1), periods=self.horizon)
+
+    def forecast(self, last_date, last_close, daily_change, volatility=DEFAULT_VOLATILITY, seed=None):
+        """Forecast one series, returning a DataFrame of Price, Lower and Upper indexed by date"""
+        rng = np.random.default_rng(self.seed if seed is None else seed)
+        paths = self.simulate([last_close], [daily_change], [volatility], rng)
+        median, lower, upper = self.summarize(paths)
+
+        dates = self.forecast_dates(last_date)
+        prediction_df = pd.DataFrame({
+            'Date': dates,
+            'Price': median[0],
+            'Lower': lower[0],
+            'Upper': upper[0]
+        })
+        prediction_df.set_index('Date', inplace=True)
+        return prediction_df
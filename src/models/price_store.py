@@ -0,0 +1,138 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.file_utils import atomic_write, safe_ticker_path
+
+# Row layout of a ticker's price matrix; row 0 holds the trading day as days since the epoch
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+DAY_ROW = 0
+CLOSE_ROW = 1 + PRICE_FIELDS.index('Close')
+
+
+def to_day_numbers(index):
+    """Convert a DatetimeIndex (tz-aware or naive) into days since the epoch"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[D]').astype(np.int64)
+
+
+class PriceStore:
+    """Local OHLCV history, one (1 + fields) x days float64 .npy file per ticker
+
+    Files are memory-mapped read-only, so a window is a slice of the mapped file, and
+    each row is contiguous so a single field (e.g. Close) of a window is a contiguous view.
+    """
+
+    def __init__(self, price_dir='stock_data/prices', refresh_interval=3600):
+        self.price_dir = price_dir
+        # Seconds before a ticker's latest bars are fetched again
+        self.refresh_interval = refresh_interval
+        self._arrays = {}
+        self._lock = threading.Lock()
+
+    def _path(self, ticker, extension='npy'):
+        return safe_ticker_path(self.price_dir, ticker, extension)
+
+    def load(self, ticker):
+        """Return the memory-mapped price matrix for a ticker, or None if nothing is stored"""
+        path = self._path(ticker)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self._arrays.get(ticker)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            matrix = np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"Error reading price store for {ticker}: {e}")
+            return None
+        self._arrays[ticker] = (mtime, matrix)
+        return matrix
+
+    def _load_meta(self, ticker):
+        try:
+            with open(self._path(ticker, 'json'), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def missing_start(self, ticker, start_date, now=None):
+        """Return the date to fetch from so the store covers start_date to today, or None if it already does
+
+        Everything from start_date is fetched if older history is needed; otherwise only
+        the days from the last stored bar on, re-fetching that bar in case it was partial.
+        """
+        now = time.time() if now is None else now
+        matrix = self.load(ticker)
+        meta = self._load_meta(ticker)
+        start_day = int(np.datetime64(start_date, 'D').astype(np.int64))
+
+        if start_day < meta.get('covered_from', start_day + 1):
+            return start_date
+        # Also holds for tickers with no bars at all, so a ticker with no data isn't re-fetched every call
+        if now - meta.get('checked_at', 0) < self.refresh_interval:
+            return None
+        if matrix is None or matrix.shape[1] == 0:
+            return start_date
+        return np.datetime64(int(matrix[DAY_ROW, -1]), 'D').item()
+
+    def append(self, ticker, hist, start_date, now=None):
+        """Merge freshly fetched bars into a ticker's file, newer values replacing stored ones"""
+        now = time.time() if now is None else now
+        start_day = int(np.datetime64(start_date, 'D').astype(np.int64))
+
+        with self._lock:
+            matrix = self.load(ticker)
+            meta = self._load_meta(ticker)
+
+            if hist is not None and not hist.empty:
+                new = np.empty((1 + len(PRICE_FIELDS), len(hist)), dtype=np.float64)
+                new[DAY_ROW] = to_day_numbers(hist.index)
+                new[1:] = hist.reindex(columns=PRICE_FIELDS).to_numpy(dtype=np.float64).T
+                if matrix is not None:
+                    # Keep stored days the new bars don't cover, then sort by day
+                    keep = ~np.isin(matrix[DAY_ROW], new[DAY_ROW])
+                    new = np.concatenate([matrix[:, keep], new], axis=1)
+                    new = new[:, np.argsort(new[DAY_ROW], kind='stable')]
+                self._save_matrix(ticker, new)
+
+            covered_from = min(meta.get('covered_from', start_day), start_day)
+            self._save_meta(ticker, {'covered_from': covered_from, 'checked_at': now})
+
+    def get_frame(self, ticker, start_date):
+        """Return the stored bars from start_date on as a DataFrame backed by the mapped file, or None"""
+        matrix = self.load(ticker)
+        if matrix is None:
+            return None
+
+        start_day = np.datetime64(start_date, 'D').astype(np.int64)
+        window = matrix[:, np.searchsorted(matrix[DAY_ROW], start_day):]
+        if window.shape[1] == 0:
+            return None
+
+        index = pd.DatetimeIndex(window[DAY_ROW].astype('int64').astype('datetime64[D]'), name='Date')
+        # The transposed slice becomes the frame's single float block without copying
+        return pd.DataFrame(window[1:].T, index=index, columns=PRICE_FIELDS, copy=False)
+
+    def _save_matrix(self, ticker, matrix):
+        try:
+            with atomic_write(self._path(ticker), 'wb') as f:
+                np.save(f, np.ascontiguousarray(matrix))
+        except OSError as e:
+            print(f"Error saving price store for {ticker}: {e}")
+
+    def _save_meta(self, ticker, meta):
+        try:
+            with atomic_write(self._path(ticker, 'json')) as f:
+                json.dump(meta, f)
+        except OSError as e:
+            print(f"Error saving price store metadata for {ticker}: {e}")
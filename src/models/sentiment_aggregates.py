@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+
+from utils.file_utils import atomic_write, safe_ticker_path
+
+CATEGORIES = ('Bullish', 'Neutral', 'Bearish')
+
+
+class DecayedSentiment:
+    """Exponentially time-decayed running sentiment for one ticker
+
+    Sums are stored as of updated_at; every weight halves each half_life seconds, so
+    advancing the state is one multiplication and the average is unchanged by time passing.
+    """
+
+    def __init__(self, weighted_sum=0.0, weight=0.0, counts=None, updated_at=None, seen=None):
+        self.weighted_sum = weighted_sum
+        self.weight = weight
+        self.counts = dict.fromkeys(CATEGORIES, 0.0)
+        self.counts.update(counts or {})
+        self.updated_at = updated_at
+        # Headline keys already folded in, oldest first
+        self.seen = dict.fromkeys(seen or ())
+
+    def decay_factor(self, now, half_life):
+        if self.updated_at is None:
+            return 1.0
+        return 0.5 ** (max(0.0, now - self.updated_at) / half_life)
+
+    def advance(self, now, half_life):
+        """Decay the sums forward to now"""
+        factor = self.decay_factor(now, half_life)
+        self.weighted_sum *= factor
+        self.weight *= factor
+        for category in self.counts:
+            self.counts[category] *= factor
+        self.updated_at = now
+
+    def to_dict(self):
+        return {
+            'weighted_sum': self.weighted_sum,
+            'weight': self.weight,
+            'counts': self.counts,
+            'updated_at': self.updated_at,
+            'seen': list(self.seen)
+        }
+
+
+class DecayedSentimentAggregator:
+    """Per-ticker decayed sentiment state, updated with only unseen headlines and persisted per ticker"""
+
+    def __init__(self, state_dir='cache/aggregates', lexicon_version=None, half_life_hours=48, max_seen=2000):
+        self.state_dir = state_dir
+        # State built from a different lexicon's scores is discarded rather than reused
+        self.lexicon_version = lexicon_version
+        self.half_life = half_life_hours * 3600
+        self.max_seen = max_seen
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _path(self, ticker):
+        return safe_ticker_path(self.state_dir, ticker, 'json')
+
+    def _load(self, ticker):
+        # ticker is already upper-cased, so 'aapl' and 'AAPL' share one state and one file
+        state = self._states.get(ticker)
+        if state is not None:
+            return state
+
+        state = DecayedSentiment()
+        try:
+            with open(self._path(ticker), 'r') as f:
+                data = json.load(f)
+            if data.get('lexicon_version') == self.lexicon_version:
+                state = DecayedSentiment(**data['state'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        self._states[ticker] = state
+        return state
+
+    def update(self, ticker, keys, compounds, categories, ages, now=None):
+        """Fold headlines into a ticker's state, skipping keys already counted
+
+        ages are the seconds between each headline's publication and now; future
+        timestamps count as brand new. Returns the number of headlines added.
+        """
+        now = time.time() if now is None else now
+        ticker = ticker.upper()
+        with self._lock:
+            state = self._load(ticker)
+            state.advance(now, self.half_life)
+
+            added = 0
+            for key, compound, category, age in zip(keys, compounds, categories, ages):
+                if key in state.seen:
+                    continue
+                weight = 0.5 ** (max(0.0, age) / self.half_life)
+                state.weighted_sum += weight * compound
+                state.weight += weight
+                state.counts[category] = state.counts.get(category, 0.0) + weight
+                state.seen[key] = None
+                added += 1
+
+            if len(state.seen) > self.max_seen:
+                for key in list(state.seen)[:len(state.seen) - self.max_seen]:
+                    del state.seen[key]
+            if added:
+                self._save(ticker, state)
+            return added
+
+    def get(self, ticker, now=None):
+        """Return the decayed aggregate for a ticker as of now, or None if nothing has been recorded"""
+        now = time.time() if now is None else now
+        ticker = ticker.upper()
+        with self._lock:
+            state = self._load(ticker)
+            if state.updated_at is None or state.weight <= 0:
+                return None
+            factor = state.decay_factor(now, self.half_life)
+            return {
+                'avg_sentiment': state.weighted_sum / state.weight,
+                'weight': state.weight * factor,
+                'counts': {category: value * factor for category, value in state.counts.items()},
+                'updated_at': state.updated_at,
+                'age': max(0.0, now - state.updated_at)
+            }
+
+    def _save(self, ticker, state):
+        try:
+            with atomic_write(self._path(ticker)) as f:
+                json.dump({'lexicon_version': self.lexicon_version, 'state': state.to_dict()}, f)
+        except OSError as e:
+            print(f"Error saving sentiment aggregate for {ticker}: {e}")
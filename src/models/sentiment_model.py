@@ -1,55 +1,153 @@
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import pandas as pd
-import nltk
+import numpy as np
 import os
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from model.headline_index import HeadlineIndex, headline_key
+from model.lexicon_store import LEXICON_VERSION, build_analyzer
+from model.score_cache import ScoreCache
+from model.sentiment_aggregates import DecayedSentimentAggregator
+from model.lexicon_scorer import CompiledLexiconScorer, SCORE_FIELDS
+from utils.data_utils import DataUtils, COMPACT_NEWS_FIELDS
 
-# Set a specific directory for NLTK data
-nltk_data_dir = os.path.join(os.path.expanduser('~'), 'nltk_data')
-os.makedirs(nltk_data_dir, exist_ok=True)
-nltk.data.path.append(nltk_data_dir)
+# Analyzer owned by a batch-scoring worker process, built once by _init_batch_worker
+_worker_sia = None
 
-# Download VADER lexicon
-nltk.download('vader_lexicon', quiet=True, download_dir=nltk_data_dir)
+def _init_batch_worker():
+    global _worker_sia
+    _worker_sia = build_analyzer()
+
+def _score_chunk(texts):
+    """Score a chunk of texts in a worker process, returning one [neg, neu, pos, compound] row per text"""
+    rows = []
+    for text in texts:
+        scores = _worker_sia.polarity_scores(text)
+        rows.append([scores[field] for field in SCORE_FIELDS])
+    return rows
+
+def score_cache_key(text, lexicon_version=LEXICON_VERSION):
+    """Key a text's scores by its whitespace-normalized form and the lexicon that scored it"""
+    # Case is kept because VADER treats ALL-CAPS words as emphasis
+    return (lexicon_version, ' '.join(str(text).split()))
 
 class SentimentModel:
-    def __init__(self):
-        self.sia = SentimentIntensityAnalyzer()
+    # 'vader' scores with NLTK's analyzer, 'compiled' with the faster precompiled lexicon scorer
+    ENGINES = ('vader', 'compiled')
+    
+    def __init__(self, headline_index=None, batch_workers=None, batch_chunk_size=500, score_cache_size=10000,
+                 engine='vader', aggregates=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown sentiment engine: {engine}")
         # Add finance-specific terms to the lexicon to improve accuracy
-        self.sia.lexicon.update({
-            'bullish': 3.0, 'bearish': -3.0,
-            'outperform': 2.0, 'underperform': -2.0,
-            'buy': 2.0, 'sell': -2.0,
-            'upgrade': 2.5, 'downgrade': -2.5,
-            'beat': 2.0, 'miss': -2.0,
-            'exceeded': 2.0, 'fell short': -2.0,
-            'growth': 1.5, 'decline': -1.5,
-            'profit': 1.5, 'loss': -1.5,
-            'positive': 1.0, 'negative': -1.0,
-            'strong': 1.0, 'weak': -1.0,
-            'surge': 2.0, 'plunge': -2.0,
-            'rise': 1.0, 'fall': -1.0,
-            'above': 1.0, 'below': -1.0,
-            'higher': 1.0, 'lower': -1.0,
-            'increase': 1.0, 'decrease': -1.0,
-            'gain': 1.0, 'lose': -1.0,
-            'success': 1.5, 'failure': -1.5,
-            'promising': 1.0, 'disappointing': -1.0,
-            'optimistic': 1.0, 'pessimistic': -1.0,
-            'opportunity': 1.0, 'risk': -0.5,
-            'recommend': 1.5, 'avoid': -1.5,
-            'dividend': 1.0, 'debt': -0.5,
-            'rally': 2.0, 'crash': -2.5,
-            'breakthrough': 2.0, 'breakdown': -2.0,
-            'outlook': 0.5, 'guidance': 0.5,
-            'target': 0.5, 'estimate': 0.5
-        })
+        self.sia = build_analyzer()
+        self.engine = engine
+        self.scorer = CompiledLexiconScorer(self.sia.lexicon) if engine == 'compiled' else None
+        # Engines score slightly differently, so their cached scores are kept apart
+        self.lexicon_version = LEXICON_VERSION if engine == 'vader' else f'{LEXICON_VERSION}-{engine}'
+        self.headline_index = headline_index or HeadlineIndex(lexicon_version=self.lexicon_version)
+        # Running time-decayed sentiment per ticker, fed by every scored news frame
+        self.aggregates = aggregates or DecayedSentimentAggregator(lexicon_version=self.lexicon_version)
+        # Large batches are split into chunks of batch_chunk_size and scored across batch_workers processes
+        self.batch_workers = batch_workers or os.cpu_count() or 1
+        self.batch_chunk_size = batch_chunk_size
+        self._pool = None
+        # Memoized scores shared by single and batch scoring; syndicated headlines repeat across tickers
+        self.score_cache = ScoreCache(maxsize=score_cache_size)
+    
+    def _polarity_scores(self, text):
+        if self.scorer is not None:
+            return self.scorer.polarity_scores(text)
+        return self.sia.polarity_scores(text)
     
     def analyze_sentiment(self, text):
-        """Analyze sentiment using VADER"""
-        sentiment_scores = self.sia.polarity_scores(text)
+        """Analyze sentiment using the configured engine"""
+        key = score_cache_key(text, self.lexicon_version)
+        cached = self.score_cache.get(key)
+        if cached is not None:
+            return dict(zip(SCORE_FIELDS, cached))
+        
+        sentiment_scores = self._polarity_scores(text)
+        self.score_cache.put(key, tuple(sentiment_scores[field] for field in SCORE_FIELDS))
         return sentiment_scores
     
+    def get_cache_stats(self):
+        """Return hit/miss/eviction counters for the score cache"""
+        return self.score_cache.stats()
+    
+    def _get_pool(self):
+        # Created on first use, with workers started from a clean forkserver (or spawn) process
+        # rather than forked from a parent that may already hold threads and locks
+        if self._pool is None:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._pool = ProcessPoolExecutor(max_workers=self.batch_workers, initializer=_init_batch_worker,
+                                             mp_context=multiprocessing.get_context(start_method))
+            atexit.register(self._pool.shutdown, cancel_futures=True)
+        return self._pool
+    
+    def analyze_batch(self, texts):
+        """Score many texts at once, returning columnar neg/neu/pos/compound arrays"""
+        texts = [str(text) for text in texts]
+        keys = [score_cache_key(text, self.lexicon_version) for text in texts]
+        
+        # Look every text up in the memo cache and only score the distinct misses
+        rows = [self.score_cache.get(key) for key in keys]
+        missing = {}
+        for key, text, row in zip(keys, texts, rows):
+            if row is None and key not in missing:
+                missing[key] = text
+        missing_texts = list(missing.values())
+        
+        if self.scorer is not None:
+            # The compiled scorer is cheap enough that process-pool IPC would dominate
+            scored = [self.scorer.score(text) for text in missing_texts]
+        elif self.batch_workers > 1 and len(missing_texts) > self.batch_chunk_size:
+            chunks = [missing_texts[i:i + self.batch_chunk_size] for i in range(0, len(missing_texts), self.batch_chunk_size)]
+            scored = [tuple(row) for chunk_rows in self._get_pool().map(_score_chunk, chunks) for row in chunk_rows]
+        else:
+            scored = []
+            for text in missing_texts:
+                scores = self.sia.polarity_scores(text)
+                scored.append(tuple(scores[field] for field in SCORE_FIELDS))
+        
+        scored_by_key = dict(zip(missing, scored))
+        for key, row in scored_by_key.items():
+            self.score_cache.put(key, row)
+        rows = [row if row is not None else scored_by_key[key] for key, row in zip(keys, rows)]
+        
+        matrix = np.array(rows, dtype=float).reshape(len(texts), len(SCORE_FIELDS))
+        return {field: matrix[:, i] for i, field in enumerate(SCORE_FIELDS)}
+    
+    def _batch_to_records(self, batch):
+        """Convert analyze_batch output back into one score dict per text"""
+        columns = [batch[field].tolist() for field in SCORE_FIELDS]
+        return [dict(zip(SCORE_FIELDS, values)) for values in zip(*columns)]
+    
+    def headline_keys(self, news_df):
+        """Return the headline index key of every row in a news frame"""
+        sources = news_df['source'] if 'source' in news_df.columns else [''] * len(news_df)
+        return [headline_key(headline, source) for headline, source in zip(news_df['headline'], sources)]
+    
+    def score_headlines(self, news_df, ticker=None, keys=None):
+        """Score each headline, reusing indexed scores for headlines already seen for the ticker"""
+        if ticker is None:
+            return self._batch_to_records(self.analyze_batch(news_df['headline']))
+        
+        keys = keys if keys is not None else self.headline_keys(news_df)
+        known = self.headline_index.lookup(ticker, keys)
+        
+        # Only headlines we haven't seen before go through VADER
+        new_headlines = {}
+        for key, headline in zip(keys, news_df['headline']):
+            if key not in known and key not in new_headlines:
+                new_headlines[key] = headline
+        new_records = self._batch_to_records(self.analyze_batch(new_headlines.values()))
+        new_scores = dict(zip(new_headlines, new_records))
+        self.headline_index.add(ticker, new_scores)
+        
+        return [known.get(key) or new_scores[key] for key in keys]
+    
     def categorize_sentiment(self, compound_score):
         """Categorize sentiment based on compound score"""
         if compound_score >= 0.3:
@@ -59,8 +157,71 @@ class SentimentModel:
         else:
             return 'Neutral'
     
-    def analyze_ticker_news_sentiment(self, news_df, days_back=5):
-        """Process sentiment for news data"""
+    def categorize_batch(self, compound_scores):
+        """Categorize many compound scores at once, with the same thresholds as categorize_sentiment"""
+        compound_scores = np.asarray(compound_scores, dtype=float)
+        return np.where(compound_scores >= 0.3, 'Bullish',
+                        np.where(compound_scores <= -0.3, 'Bearish', 'Neutral'))
+    
+    def score_news(self, news_df, ticker=None, now=None):
+        """Add sentiment, compound, category and parsed_date columns to a news frame"""
+        now = now or datetime.now()
+        keys = self.headline_keys(news_df) if ticker is not None else None
+        news_df['sentiment'] = self.score_headlines(news_df, ticker, keys)
+        news_df['compound'] = news_df['sentiment'].apply(lambda x: x['compound'])
+        news_df['category'] = self.categorize_batch(news_df['compound'])
+        
+        # Normalize every date format in one vectorized pass
+        news_df['parsed_date'] = DataUtils.normalize_news_dates(news_df, now)
+        
+        if ticker is not None:
+            # Headlines without a usable date are treated as just published
+            ages = (now - news_df['parsed_date']).dt.total_seconds().fillna(0)
+            self.aggregates.update(ticker, keys, news_df['compound'], news_df['category'], ages, now.timestamp())
+        return news_df
+    
+    def calculate_investment_score(self, avg_sentiment):
+        """Map an average compound score onto the 0-100 investment score"""
+        # Formula: base 50 + normalized sentiment * 50
+        # Normalized sentiment: scale sentiment from -1 to 1 into 0 to 1
+        normalized_sentiment = (avg_sentiment + 1) / 2
+        investment_score = 50 + (normalized_sentiment - 0.5) * 100
+        
+        # Apply sentiment strength as a multiplier - strong sentiments have more impact
+        return min(100, max(0, investment_score * (1 + abs(avg_sentiment))))
+    
+    def get_ticker_aggregate(self, ticker, max_age=None):
+        """Return the time-decayed sentiment summary for a ticker without rescanning news
+        
+        Returns None if nothing has been scored for the ticker, or if its state was last
+        updated more than max_age seconds ago.
+        """
+        aggregate = self.aggregates.get(ticker)
+        if aggregate is None or (max_age is not None and aggregate['age'] > max_age):
+            return None
+        
+        avg_sentiment = aggregate['avg_sentiment']
+        counts = aggregate['counts']
+        return {
+            'avg_sentiment': avg_sentiment,
+            'sentiment_category': self.categorize_sentiment(avg_sentiment),
+            'bullish_weight': counts.get('Bullish', 0.0),
+            'neutral_weight': counts.get('Neutral', 0.0),
+            'bearish_weight': counts.get('Bearish', 0.0),
+            'news_weight': aggregate['weight'],
+            'sentiment_strength': abs(avg_sentiment),
+            'investment_score': self.calculate_investment_score(avg_sentiment),
+            'updated_at': datetime.fromtimestamp(aggregate['updated_at']).isoformat(),
+            'age_seconds': aggregate['age']
+        }
+    
+    def summarize_news_sentiment(self, news_df, days_back=5, now=None, include_details=True,
+                                 news_fields=None, news_format='records'):
+        """Aggregate a scored news frame (see score_news) into the ticker sentiment summary
+        
+        news_details is omitted when include_details is False, restricted to news_fields
+        when given, and returned as one array per column when news_format is 'columnar'.
+        """
         if news_df.empty:
             return {
                 'avg_sentiment': 0,
@@ -72,50 +233,10 @@ class SentimentModel:
                 'sentiment_strength': 0,
                 'investment_score': 50  # Neutral score
             }
-            
-        # Add sentiment analysis
-        news_df['sentiment'] = news_df['headline'].apply(self.analyze_sentiment)
-        news_df['compound'] = news_df['sentiment'].apply(lambda x: x['compound'])
-        news_df['category'] = news_df['compound'].apply(self.categorize_sentiment)
         
-        # Convert date columns for filtering
-        today = datetime.now()
+        # Filter by recency
+        today = now or datetime.now()
         cutoff_date = today - timedelta(days=days_back)
-        
-        # Clean date formats and filter by recency
-        def parse_date(row):
-            try:
-                if row['date'] == '' or (isinstance(row['date'], str) and 'ago' in row['date'].lower()):
-                    return today
-                
-                if isinstance(row['date'], str) and '/' in row['date']:
-                    parts = row['date'].split('/')
-                    if len(parts) == 3:
-                        month, day, year = parts
-                        if len(year) == 2:
-                            year = '20' + year
-                        return datetime(int(year), int(month), int(day))
-                elif isinstance(row['date'], str) and '-' in row['date']:
-                    try:
-                        return datetime.strptime(row['date'], '%b-%d-%y')
-                    except:
-                        try:
-                            return datetime.strptime(row['date'], '%Y-%m-%d')
-                        except:
-                            return today
-                else:
-                    # For relative dates
-                    if isinstance(row['date'], str) and row['date'].lower() == 'today':
-                        return today
-                    elif isinstance(row['date'], str) and row['date'].lower() == 'yesterday':
-                        return today - timedelta(days=1)
-                    else:
-                        return today
-            except Exception as e:
-                print(f"Date parsing error: {e} for date: {row['date']}")
-                return today
-        
-        news_df['parsed_date'] = news_df.apply(parse_date, axis=1)
         filtered_df = news_df[news_df['parsed_date'] >= cutoff_date]
         
         # If we have no news after filtering, use all available news
@@ -123,7 +244,7 @@ class SentimentModel:
             filtered_df = news_df
         
         # Calculate overall sentiment
-        avg_sentiment = filtered_df['compound'].mean()
+        avg_sentiment = float(filtered_df['compound'].mean())
         sentiment_category = self.categorize_sentiment(avg_sentiment)
         
         # Calculate sentiment strength (magnitude of sentiment)
@@ -133,25 +254,37 @@ class SentimentModel:
         sentiment_counts = filtered_df['category'].value_counts()
         
         # Calculate an investment score (0-100)
-        # Formula: base 50 + normalized sentiment * 50
-        # Normalized sentiment: scale sentiment from -1 to 1 into 0 to 1
-        normalized_sentiment = (avg_sentiment + 1) / 2
-        investment_score = 50 + (normalized_sentiment - 0.5) * 100
-        
-        # Apply sentiment strength as a multiplier - strong sentiments have more impact
-        investment_score = min(100, max(0, investment_score * (1 + sentiment_strength)))
+        investment_score = self.calculate_investment_score(avg_sentiment)
         
         # Prepare results
         results = {
             'avg_sentiment': avg_sentiment,
             'sentiment_category': sentiment_category,
-            'bullish_count': sentiment_counts.get('Bullish', 0),
-            'neutral_count': sentiment_counts.get('Neutral', 0),
-            'bearish_count': sentiment_counts.get('Bearish', 0),
+            'bullish_count': int(sentiment_counts.get('Bullish', 0)),
+            'neutral_count': int(sentiment_counts.get('Neutral', 0)),
+            'bearish_count': int(sentiment_counts.get('Bearish', 0)),
             'news_count': len(filtered_df),
             'sentiment_strength': sentiment_strength,
-            'investment_score': investment_score,
-            'news_details': filtered_df.to_dict('records')
+            'investment_score': investment_score
         }
         
-        return results
\ No newline at end of file
+        if include_details:
+            if news_format == 'columnar':
+                results['news_details'] = DataUtils.frame_to_columns(filtered_df, news_fields or COMPACT_NEWS_FIELDS)
+            elif news_fields:
+                columns = [field for field in news_fields if field in filtered_df.columns]
+                results['news_details'] = filtered_df[columns].to_dict('records')
+            else:
+                results['news_details'] = filtered_df.to_dict('records')
+        
+        return results
+    
+    def analyze_ticker_news_sentiment(self, news_df, days_back=5, ticker=None, include_details=True,
+                                      news_fields=None, news_format='records'):
+        """Process sentiment for news data"""
+        if news_df.empty:
+            return self.summarize_news_sentiment(news_df)
+        
+        today = datetime.now()
+        self.score_news(news_df, ticker, today)
+        return self.summarize_news_sentiment(news_df, days_back, today, include_details, news_fields, news_format)
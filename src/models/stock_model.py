@@ -1,115 +1,52 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
 import os
 import json
 from datetime import datetime, timedelta
+from model.indicators import IndicatorEngine
+from model.prediction_engine import MonteCarloEngine, MIN_HISTORY, blend_daily_change, trend_inputs, usable_volatility
+from model.price_store import PriceStore, DAY_ROW, CLOSE_ROW
+from model.universe_store import UniverseStore
+
+# Result fields carried into the ranking
+RANKING_COLUMNS = ['ticker', 'name', 'avg_sentiment', 'sentiment_category', 'investment_score', 'news_count']
 
 class StockModel:
-    def __init__(self):
-        pass
+    def __init__(self, universe=None, prices=None, prediction_engine=None, indicators=None):
+        # Snapshot of the S&P 500 with market caps, refreshed in the background when stale
+        self.universe = universe or UniverseStore()
+        # Local OHLCV history so repeated price queries only fetch the days not yet stored
+        self.prices = prices or PriceStore()
+        self.prediction_engine = prediction_engine or MonteCarloEngine()
+        # Rolling moving averages and return statistics, kept next to the price files
+        self.indicators = indicators or IndicatorEngine(self.prices.price_dir)
         
     def get_top_100_stocks(self):
         """Get the list of top 100 stocks by market cap"""
+        return self.universe.get_top(100)
+    
+    def get_stock_price_data(self, ticker, days=90):
+        """Get historical stock price data, fetching only the days missing from the local price store"""
         try:
-            # Use yfinance to get S&P 500 components as a starting point
-            sp500_url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-            sp500_table = pd.read_html(sp500_url)
-            sp500_df = sp500_table[0]
-            
-            # Get tickers and get market cap data
-            tickers = sp500_df['Symbol'].tolist()
-            
-            print(f"Fetching market cap data for {len(tickers)} stocks...")
-            
-            # Get market cap data in chunks to avoid overloading
-            results = []
-            chunk_size = 20
-            ticker_chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=days)
             
-            for chunk in ticker_chunks:
-                chunk_data = []
-                for ticker in chunk:
-                    try:
-                        stock = yf.Ticker(ticker)
-                        info = stock.info
-                        market_cap = info.get('marketCap', 0)
-                        name = info.get('shortName', ticker)
-                        sector = info.get('sector', 'Unknown')
-                        chunk_data.append({
-                            'ticker': ticker,
-                            'name': name,
-                            'market_cap': market_cap,
-                            'sector': sector
-                        })
-                    except Exception as e:
-                        print(f"Error fetching data for {ticker}: {e}")
-                    
-                    # Be gentle with API requests
-                    import time
-                    time.sleep(0.5)
-                
-                results.extend(chunk_data)
-                print(f"Processed {len(chunk)} stocks...")
-                time.sleep(1)  # Pause between chunks
+            fetch_start = self.prices.missing_start(ticker, start_date.date())
+            if fetch_start is not None:
+                # yfinance is slow to import, so it's only loaded once live market data is needed
+                import yfinance as yf
                 
-            # Convert to DataFrame and sort by market cap
-            stocks_df = pd.DataFrame(results)
-            stocks_df = stocks_df.sort_values('market_cap', ascending=False).reset_index(drop=True)
-            
-            # Take top 100
-            top_100 = stocks_df.head(100)
-            return top_100
-        
-        except Exception as e:
-            print(f"Error getting top 100 stocks: {e}")
-            # Fallback to a manual list of major stocks
-            fallback_tickers = [
-                "AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "NVDA", "BRK-B", "JPM", "V",
-                "JNJ", "UNH", "PG", "MA", "HD", "BAC", "XOM", "AVGO", "CVX", "COST",
-                "ABBV", "MRK", "PEP", "KO", "LLY", "TMO", "CSCO", "ABT", "CRM", "MCD",
-                "ACN", "WMT", "NKE", "DHR", "TXN", "UPS", "NEE", "PM", "ORCL", "IBM",
-                "QCOM", "INTC", "NFLX", "ADBE", "AMD", "CMCSA", "HON", "PFE", "CAT", "UNP"
-            ]
-            
-            results = []
-            for ticker in fallback_tickers[:100]:  # Limit to top 50 in fallback
                 try:
                     stock = yf.Ticker(ticker)
-                    info = stock.info
-                    market_cap = info.get('marketCap', 0)
-                    name = info.get('shortName', ticker)
-                    sector = info.get('sector', 'Unknown')
-                    results.append({
-                        'ticker': ticker,
-                        'name': name,
-                        'market_cap': market_cap,
-                        'sector': sector
-                    })
+                    hist = stock.history(start=fetch_start, end=end_date + timedelta(days=1))
+                    self.prices.append(ticker, hist, start_date.date())
                 except Exception as e:
-                    print(f"Error in fallback list for {ticker}: {e}")
-                    results.append({
-                        'ticker': ticker,
-                        'name': ticker,
-                        'market_cap': 0,
-                        'sector': 'Unknown'
-                    })
-                
-                time.sleep(0.5)
-                
-            fallback_df = pd.DataFrame(results)
-            return fallback_df
-    
-    def get_stock_price_data(self, ticker, days=90):
-        """Get historical stock price data using yfinance"""
-        try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
+                    # Serve whatever is already stored rather than failing the request
+                    print(f"Error fetching price data for {ticker}: {e}")
             
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date)
+            hist = self.prices.get_frame(ticker, start_date.date())
             
-            if hist.empty:
+            if hist is None or hist.empty:
                 print(f"No price data found for {ticker}")
                 return None
                 
@@ -118,125 +55,156 @@ class StockModel:
             print(f"Error getting price data for {ticker}: {e}")
             return None
     
-    def predict_stock_trend(self, price_data, sentiment_score):
-        """Generate a simple prediction based on historical prices and sentiment"""
-        if price_data is None or len(price_data) < 5:
-            return None
-        
-        # Get the last closing price
-        last_close = price_data['Close'].iloc[-1]
-        
-        # Calculate a simple moving average for the last 10 days
-        # Handle case where there are fewer than 10 days of data
-        short_ma = price_data['Close'].rolling(window=min(10, len(price_data))).mean().iloc[-1]
-        
-        # Calculate a simple moving average for the last 30 days
-        # Handle case where there are fewer than 30 days of data
-        long_ma = price_data['Close'].rolling(window=min(30, len(price_data))).mean().iloc[-1]
-        
-        # Calculate average daily price change over last 30 days
-        avg_daily_change = price_data['Close'].pct_change().mean()
-        
-        # Convert sentiment to a price adjustment factor
-        # Scale from -1 to 1 into a price multiplier (0.9 to 1.1)
-        sentiment_factor = 1 + (sentiment_score / 10)
-        
-        # Get price momentum - compare recent vs longer-term average
-        momentum = short_ma / long_ma - 1
-        
-        # Generate 30 days of predictions
-        prediction_days = 30
-        dates = pd.date_range(start=price_data.index[-1] + pd.Timedelta(days=1), periods=prediction_days)
-        
-        # Start with the last closing price
-        predicted_prices = [last_close]
-        
-        # Generate future prices with a blend of momentum, average change and sentiment
-        for i in range(1, prediction_days):
-            # Calculate predicted change
-            daily_change = (avg_daily_change + momentum/10) * sentiment_factor
-            
-            # Calculate next day's price based on previous predicted price
-            next_price = predicted_prices[-1] * (1 + daily_change)
+    def get_bulk_price_data(self, tickers, days=90, field='Close', chunk_size=50):
+        """Get one price field for many tickers as a date x ticker matrix
+        
+        Tickers missing recent bars are refreshed with one grouped yf.download per chunk
+        instead of one request each; tickers with no data are left out of the columns.
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        
+        # Group the tickers that need fetching by where their fetch starts
+        fetch_groups = {}
+        for ticker in tickers:
+            fetch_start = self.prices.missing_start(ticker, start_date.date())
+            if fetch_start is not None:
+                fetch_groups.setdefault(fetch_start, []).append(ticker)
+        
+        if fetch_groups:
+            import yfinance as yf
             
-            # Add some random noise
-            noise = np.random.normal(0, 0.005)  # 0.5% standard deviation
-            next_price = next_price * (1 + noise)
-            
-            predicted_prices.append(next_price)
-        
-        prediction_df = pd.DataFrame({
-            'Date': dates,
-            'Price': predicted_prices
-        })
-        prediction_df.set_index('Date', inplace=True)
-        
-        return prediction_df
-        
-    def rank_stocks_by_investment_potential(self, results_list):
-        """Rank stocks by investment potential and generate summary report"""
-        # Create DataFrame from results
-        columns = ['ticker', 'name', 'avg_sentiment', 'sentiment_category', 
-                  'investment_score', 'news_count']
-        
-        data = []
-        for result in results_list:
-            if result:  # Skip None results
-                row = [result.get(col, None) for col in columns]
-                data.append(row)
+            for fetch_start, group in fetch_groups.items():
+                for i in range(0, len(group), chunk_size):
+                    chunk = group[i:i + chunk_size]
+                    try:
+                        data = yf.download(chunk, start=fetch_start, end=end_date + timedelta(days=1),
+                                           group_by='ticker', auto_adjust=True, progress=False, threads=True)
+                    except Exception as e:
+                        print(f"Error downloading prices for {len(chunk)} tickers: {e}")
+                        continue
+                    
+                    for ticker in chunk:
+                        if isinstance(data.columns, pd.MultiIndex):
+                            if ticker not in data.columns.get_level_values(0):
+                                # Record the empty check so the ticker isn't re-downloaded on every call
+                                self.prices.append(ticker, None, start_date.date())
+                                continue
+                            hist = data[ticker]
+                        else:
+                            hist = data
+                        self.prices.append(ticker, hist.dropna(how='all'), start_date.date())
+        
+        columns = {}
+        for ticker in tickers:
+            hist = self.prices.get_frame(ticker, start_date.date())
+            if hist is not None:
+                columns[ticker] = hist[field]
+        return pd.DataFrame(columns)
+    
+    def get_stock_indicators(self, ticker):
+        """Return the ticker's rolling indicators, advanced over only the bars stored since the last call"""
+        matrix = self.prices.load(ticker)
+        if matrix is None:
+            return None
+        return self.indicators.update(ticker, matrix[DAY_ROW], matrix[CLOSE_ROW])
+    
+    def predict_stock_trend(self, price_data, sentiment_score, seed=None, indicators=None):
+        """Generate a simple prediction based on historical prices and sentiment
+        
+        Returns Price (median), Lower and Upper columns; pass a seed for reproducible bands.
+        With indicators from get_stock_indicators the price history isn't rescanned.
+        """
+        if indicators is not None:
+            daily_change = blend_daily_change(
+                indicators['short_ma'], indicators['long_ma'], indicators['avg_daily_change'], sentiment_score
+            )
+            return self.prediction_engine.forecast(
+                pd.Timestamp(indicators['last_day']), indicators['last_close'], float(daily_change),
+                float(usable_volatility(indicators['volatility'])), seed
+            )
+        
+        if price_data is None or len(price_data) < MIN_HISTORY:
+            return None
         
-        df = pd.DataFrame(data, columns=columns)
+        # Moving averages, momentum, average daily change and volatility of the closes
+        closes = price_data['Close'].to_numpy(dtype=float)[np.newaxis, :]
+        last_close, daily_change, volatility, _ = trend_inputs(closes, [sentiment_score])
         
-        # Sort by investment score (highest first)
-        ranked_df = df.sort_values('investment_score', ascending=False).reset_index(drop=True)
+        # Median and quantile bands over many simulated 30-day paths
+        return self.prediction_engine.forecast(price_data.index[-1], last_close[0], daily_change[0], volatility[0], seed)
+    
+    def predict_stock_trend_batch(self, close_prices, sentiment_scores, seed=None):
+        """Predict every ticker of a date x ticker close matrix (see get_bulk_price_data) at once
+        
+        sentiment_scores maps each ticker to its average sentiment. Returns a dict with
+        the forecast dates, the tickers that had enough history, and their Price, Lower
+        and Upper bands as (tickers x horizon) arrays.
+        """
+        tickers = list(close_prices.columns)
+        if not tickers or close_prices.empty:
+            # Every download failed or nothing was requested: no ticker can be forecast
+            horizon = self.prediction_engine.horizon
+            return {
+                'dates': None,
+                'tickers': [],
+                'Price': np.empty((0, horizon)),
+                'Lower': np.empty((0, horizon)),
+                'Upper': np.empty((0, horizon))
+            }
+        
+        sentiment = np.array([sentiment_scores.get(ticker, 0) for ticker in tickers], dtype=float)
+        
+        last_close, daily_change, volatility, valid = trend_inputs(close_prices.to_numpy(dtype=float).T, sentiment)
+        price, lower, upper = self.prediction_engine.forecast_batch(
+            last_close[valid], daily_change[valid], volatility[valid], seed
+        )
+        
+        return {
+            'dates': self.prediction_engine.forecast_dates(close_prices.index[-1]),
+            'tickers': [ticker for ticker, ok in zip(tickers, valid) if ok],
+            'Price': price,
+            'Lower': lower,
+            'Upper': upper
+        }
+    
+    def get_batch_prediction(self, batch, ticker):
+        """Return one ticker's prediction from predict_stock_trend_batch output as a DataFrame, or None"""
+        if ticker not in batch['tickers']:
+            return None
+        row = batch['tickers'].index(ticker)
+        return pd.DataFrame({
+            'Price': batch['Price'][row],
+            'Lower': batch['Lower'][row],
+            'Upper': batch['Upper'][row]
+        }, index=batch['dates'].rename('Date'))
+        
+    def rank_stocks_by_investment_potential(self, results_list, top_k=None):
+        """Rank stocks by investment score, highest first, without writing anything
+        
+        With top_k only the best top_k stocks are selected (via argpartition) and
+        sorted, instead of sorting every stock. Reports are written by ReportWriter.
+        """
+        # Create DataFrame from results, skipping None results
+        df = pd.DataFrame.from_records([result for result in results_list if result], columns=RANKING_COLUMNS)
+        
+        # Sort by investment score (highest first); stable so ties keep their input order
+        scores = -df['investment_score'].to_numpy(dtype=float)
+        if top_k is not None and top_k < len(df):
+            if top_k > 0:
+                # argpartition picks among ties at the cut arbitrarily, so keep every stock tied
+                # with the k-th score (in input order) and let the stable sort decide, exactly
+                # as the full ranking would; "not >" also keeps NaN scores, which sort last
+                threshold = np.partition(scores, top_k - 1)[top_k - 1]
+                candidates = np.flatnonzero(~(scores > threshold))
+                order = candidates[np.argsort(scores[candidates], kind='stable')][:top_k]
+            else:
+                order = np.array([], dtype=int)
+        else:
+            order = np.argsort(scores, kind='stable')
+        ranked_df = df.iloc[order].reset_index(drop=True)
         
         # Add rank column
         ranked_df['rank'] = ranked_df.index + 1
         
-        # Prepare report
-        report = "# Investment Potential Ranking Based on Sentiment Analysis\n\n"
-        report += f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
-        
-        # Add top 10 recommendations
-        report += "## Top 10 Investment Recommendations\n\n"
-        top10 = ranked_df.head(10)
-        
-        for i, row in top10.iterrows():
-            report += f"{row['rank']}. **{row['ticker']}** ({row['name']})\n"
-            report += f"   - Investment Score: {row['investment_score']:.1f}/100\n"
-            report += f"   - Sentiment: {row['sentiment_category']} ({row['avg_sentiment']:.2f})\n"
-            report += f"   - Based on {row['news_count']} news articles\n\n"
-        
-        # Add full ranking table
-        report += "## Complete Ranking\n\n"
-        
-        # Convert DataFrame to Markdown table
-        table_df = ranked_df[['rank', 'ticker', 'name', 'investment_score', 'sentiment_category', 'news_count']].copy()
-        table_df['investment_score'] = table_df['investment_score'].round(1)
-        
-        # Create markdown table header
-        table = "| Rank | Ticker | Company | Investment Score | Sentiment | News Count |\n"
-        table += "|------|--------|---------|-----------------|-----------|------------|\n"
-        
-        # Add each row
-        for _, row in table_df.iterrows():
-            table += f"| {row['rank']} | {row['ticker']} | {row['name']} | {row['investment_score']} | {row['sentiment_category']} | {row['news_count']} |\n"
-        
-        report += table
-        
-        # Add methodology note
-        report += "\n## Methodology\n\n"
-        report += "This ranking is based on sentiment analysis of recent news articles for each stock. "
-        report += "The investment score (0-100) combines sentiment analysis with price momentum indicators. "
-        report += "A higher score suggests a more favorable investment opportunity based on current market sentiment and momentum.\n\n"
-        report += "**Note**: This analysis should be used as one factor in investment decisions, not as a sole determining factor. "
-        report += "Always conduct thorough research and consider consulting with a financial advisor before making investment decisions.\n"
-        
-        # Save report to file
-        with open('reports/investment_ranking_report.md', 'w') as f:
-            f.write(report)
-            
-        # Also save as CSV for easier data analysis
-        ranked_df.to_csv('reports/investment_ranking.csv', index=False)
-        
-        return ranked_df
\ No newline at end of file
+        return ranked_df
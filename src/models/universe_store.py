@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from model.lexicon_store import OFFLINE
+from utils.file_utils import atomic_write
+
+SP500_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+
+UNIVERSE_COLUMNS = ['ticker', 'name', 'market_cap', 'sector']
+
+# Used when neither the constituents page nor a snapshot is available
+FALLBACK_TICKERS = [
+    "AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "NVDA", "BRK-B", "JPM", "V",
+    "JNJ", "UNH", "PG", "MA", "HD", "BAC", "XOM", "AVGO", "CVX", "COST",
+    "ABBV", "MRK", "PEP", "KO", "LLY", "TMO", "CSCO", "ABT", "CRM", "MCD",
+    "ACN", "WMT", "NKE", "DHR", "TXN", "UPS", "NEE", "PM", "ORCL", "IBM",
+    "QCOM", "INTC", "NFLX", "ADBE", "AMD", "CMCSA", "HON", "PFE", "CAT", "UNP"
+]
+
+# With VESTRA_UNIVERSE_FIXTURE=<path> the universe is read from that snapshot file and never refreshed
+UNIVERSE_FIXTURE = os.environ.get('VESTRA_UNIVERSE_FIXTURE')
+
+
+def fetch_constituents():
+    """Download S&P 500 tickers, names and sectors from Wikipedia in one request"""
+    sp500_df = pd.read_html(SP500_URL)[0]
+    return pd.DataFrame({
+        # Yahoo uses dashes where the index uses dots (BRK.B -> BRK-B)
+        'ticker': sp500_df['Symbol'].astype(str).str.replace('.', '-', regex=False),
+        'name': sp500_df['Security'],
+        'sector': sp500_df['GICS Sector']
+    })
+
+
+def fetch_market_caps(tickers, chunk_size=50, max_workers=8):
+    """Fetch market caps for many tickers with concurrent per-ticker fast_info lookups
+
+    yf.Tickers only builds the Ticker objects; each market cap is still its own
+    lookup of the quote and share count (much lighter than the full info payload),
+    so the lookups run max_workers at a time and chunks only pace the progress output.
+    """
+    import yfinance as yf
+
+    def market_cap(stock):
+        try:
+            return stock.fast_info['market_cap']
+        except Exception as e:
+            print(f"Error fetching market cap for {stock.ticker}: {e}")
+            return None
+
+    market_caps = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i in range(0, len(tickers), chunk_size):
+            chunk = tickers[i:i + chunk_size]
+            stocks = yf.Tickers(' '.join(chunk)).tickers
+            caps = executor.map(market_cap, [stocks[ticker] for ticker in chunk if ticker in stocks])
+            market_caps.update(zip([ticker for ticker in chunk if ticker in stocks], caps))
+            print(f"Fetched market caps for {min(i + chunk_size, len(tickers))}/{len(tickers)} stocks...")
+    return market_caps
+
+
+class UniverseStore:
+    """Persisted snapshot of the stock universe, refreshed in the background once it goes stale"""
+
+    def __init__(self, path='stock_data/universe.json', max_age=24 * 3600, fixture_path=UNIVERSE_FIXTURE):
+        self.path = fixture_path or path
+        self.max_age = max_age
+        # A fixture is a snapshot that is never refreshed, for offline runs and tests
+        self.fixture = bool(fixture_path)
+        self._universe = None
+        self._updated_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        # Held while building the first snapshot so concurrent cold requests wait for one refresh
+        self._cold_refresh_lock = threading.Lock()
+
+    def load(self):
+        """Read the snapshot file, returning (DataFrame, updated_at) or (None, None) if there isn't one"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            universe = pd.DataFrame(data['stocks'], columns=UNIVERSE_COLUMNS)
+            universe = universe.sort_values('market_cap', ascending=False).reset_index(drop=True)
+            return universe, data.get('updated_at', 0)
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(self.path):
+                print(f"Error reading universe snapshot {self.path}: {e}")
+            return None, None
+
+    def save(self, universe, updated_at):
+        """Write the snapshot atomically"""
+        with atomic_write(self.path) as f:
+            json.dump({'updated_at': updated_at, 'stocks': universe.to_dict('records')}, f)
+
+    def is_stale(self):
+        return self._updated_at is None or time.time() - self._updated_at > self.max_age
+
+    def get_universe(self):
+        """Return the universe sorted by market cap, starting a background refresh if it is stale"""
+        with self._lock:
+            if self._universe is None:
+                self._universe, self._updated_at = self.load()
+            universe = self._universe
+            refresh = not self.fixture and not OFFLINE and self.is_stale() and not self._refreshing
+            if refresh and universe is not None:
+                self._refreshing = True
+                threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+        if universe is None:
+            # First run without a snapshot: build one now, or use the fallback list offline
+            if self.fixture or OFFLINE:
+                return self.fallback_universe()
+            with self._cold_refresh_lock:
+                # Another request may have built it while this one waited
+                with self._lock:
+                    universe = self._universe
+                if universe is None:
+                    universe = self.refresh()
+        return universe
+
+    def get_top(self, limit=100):
+        """Return the largest stocks by market cap"""
+        return self.get_universe().head(limit).reset_index(drop=True)
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self):
+        """Rebuild the snapshot from the constituents list and batched market-cap lookups"""
+        try:
+            universe = fetch_constituents()
+        except Exception as e:
+            print(f"Error fetching S&P 500 constituents: {e}")
+            with self._lock:
+                if self._universe is not None:
+                    return self._universe
+            universe = self.fallback_universe()
+
+        market_caps = fetch_market_caps(universe['ticker'].tolist())
+
+        # Keep the previous market cap for tickers whose lookup failed this time
+        with self._lock:
+            previous = self._universe
+        if previous is not None:
+            for ticker, market_cap in zip(previous['ticker'], previous['market_cap']):
+                if market_caps.get(ticker) is None:
+                    market_caps[ticker] = market_cap
+
+        universe['market_cap'] = universe['ticker'].map(market_caps).fillna(0)
+        universe = universe[UNIVERSE_COLUMNS].sort_values('market_cap', ascending=False).reset_index(drop=True)
+
+        updated_at = time.time()
+        try:
+            self.save(universe, updated_at)
+        except OSError as e:
+            print(f"Error saving universe snapshot {self.path}: {e}")
+        with self._lock:
+            self._universe, self._updated_at = universe, updated_at
+        return universe
+
+    def fallback_universe(self):
+        """Return the built-in ticker list with no market data"""
+        return pd.DataFrame({
+            'ticker': FALLBACK_TICKERS,
+            'name': FALLBACK_TICKERS,
+            'market_cap': 0,
+            'sector': 'Unknown'
+        }, columns=UNIVERSE_COLUMNS)
+
+
+if __name__ == "__main__":
+    # Build the snapshot ahead of time (e.g. from a scheduled job) so requests never wait on it
+    store = UniverseStore(fixture_path=None)
+    print(f"Universe snapshot with {len(store.refresh())} stocks written to {store.path}")
@@ -0,0 +1,90 @@
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+    pass
+
+
+class CircuitBreaker:
+    """Per-source health tracker that stops calling a failing upstream until it recovers"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, base_backoff=30, max_backoff=900):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = self.CLOSED
+        self.failures = 0
+        self.backoff = base_backoff
+        self.opened_at = None
+        self.last_error = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a call may go through; after the backoff a single half-open probe is let through"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.backoff:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def is_open(self):
+        """Return True while the circuit is open and its backoff hasn't elapsed, without claiming a probe"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.backoff
+
+    def record_success(self):
+        """Close the circuit and reset the backoff"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.backoff = self.base_backoff
+            self.opened_at = None
+            self.last_error = None
+            self._probe_in_flight = False
+
+    def record_failure(self, error=None, retry_after=None):
+        """Count a failure, opening the circuit at the threshold and doubling the backoff on failed probes"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error) if error is not None else None
+            if self.state == self.HALF_OPEN:
+                self.backoff = min(self.backoff * 2, self.max_backoff)
+            elif self.failures < self.failure_threshold:
+                return
+            # Respect an explicit Retry-After from the upstream if it asks for longer
+            if retry_after:
+                self.backoff = min(max(self.backoff, retry_after), self.max_backoff)
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Give back a half-open probe whose call was abandoned without a result, so a later call can probe"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self):
+        """Return the current state as a JSON-serializable dict"""
+        with self._lock:
+            retry_in = 0
+            if self.state == self.OPEN:
+                retry_in = max(0, self.backoff - (time.monotonic() - self.opened_at))
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'backoff': self.backoff,
+                'retry_in': round(retry_in, 1),
+                'last_error': self.last_error
+            }
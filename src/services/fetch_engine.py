@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from view.http_session import get_session_manager
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace requests to a single host"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return how many seconds the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def release(self):
+        """Give back a reserved token that went unused"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    async def acquire(self, abandon=None, poll_interval=0.1):
+        """Wait (without blocking the event loop) until a token is available
+
+        If abandon is given it is polled while waiting; once it returns True the token is
+        given back and False is returned, so queued callers can stop early. Returns True
+        once the token is acquired.
+        """
+        delay = self.reserve()
+        deadline = time.monotonic() + delay
+        while delay > 0:
+            if abandon is not None and abandon():
+                self.release()
+                return False
+            await asyncio.sleep(delay if abandon is None else min(delay, poll_interval))
+            delay = deadline - time.monotonic()
+        return True
+
+    def acquire_blocking(self):
+        """Wait (blocking the calling thread) until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AsyncFetcher:
+    """Concurrent HTTP fetch engine with per-host rate limiting"""
+
+    # Requests per second and burst size used for hosts without an explicit limit
+    DEFAULT_RATE = 1.0
+    DEFAULT_BURST = 2
+
+    def __init__(self, host_limits=None, max_concurrency=16, timeout=10, session_manager=None):
+        # host_limits maps a host name to a (rate, burst) tuple
+        self.host_limits = dict(host_limits or {})
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        # Size the shared connection pools to the number of requests we can have in flight
+        self.session_manager = session_manager or get_session_manager(pool_size=max_concurrency)
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='fetch')
+
+    def get_bucket(self, url):
+        """Return the token bucket for the host of a URL"""
+        host = urlparse(url).netloc
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.host_limits.get(host, (self.DEFAULT_RATE, self.DEFAULT_BURST))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def _get(self, url, headers):
+        response = self.session_manager.get(url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    async def wait_turn(self, url, abandon=None):
+        """Wait until the host's rate limit allows a request; False if abandon() turned True first"""
+        return await self.get_bucket(url).acquire(abandon)
+
+    async def send(self, url, headers=None):
+        """Send a request right away; callers pace themselves with wait_turn"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._get, url, headers)
+
+    async def fetch(self, url, headers=None):
+        """Fetch a URL once the host's rate limit allows it"""
+        await self.wait_turn(url)
+        return await self.send(url, headers)
+
+    def wait_turn_blocking(self, url):
+        """Block until the host's rate limit allows a request"""
+        self.get_bucket(url).acquire_blocking()
+
+    def send_blocking(self, url, headers=None):
+        """Send a request from synchronous code right away"""
+        return self._get(url, headers)
+
+    def fetch_blocking(self, url, headers=None):
+        """Fetch a URL from synchronous code, honouring the same per-host rate limit"""
+        self.wait_turn_blocking(url)
+        return self.send_blocking(url, headers)
+
+    async def gather(self, coroutines):
+        """Run coroutines concurrently, with at most max_concurrency in flight"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        return await asyncio.gather(*(run(c) for c in coroutines))
+
+    def run(self, coroutine):
+        """Run a coroutine to completion from synchronous code"""
+        return asyncio.run(coroutine)
@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.file_utils import atomic_write, safe_ticker_path
+
+
+class ResponseCache:
+    """Persistent on-disk cache of news pages keyed by source and ticker"""
+
+    # Seconds a cached page is served without contacting the source
+    DEFAULT_TTLS = {
+        'finviz': 300,
+        'yahoo': 300
+    }
+
+    def __init__(self, cache_dir='cache/http', ttls=None, default_ttl=300, stale_ttl=3600):
+        self.cache_dir = cache_dir
+        self.ttls = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        # Seconds past the TTL during which a stale page is still served while it is revalidated
+        self.stale_ttl = stale_ttl
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='revalidate')
+
+    def _path(self, source, ticker):
+        return safe_ticker_path(os.path.join(self.cache_dir, source), ticker, 'json')
+
+    def load(self, source, ticker):
+        """Return the cached entry for a source and ticker, or None"""
+        try:
+            with open(self._path(source, ticker), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, source, ticker, entry):
+        with atomic_write(self._path(source, ticker)) as f:
+            json.dump(entry, f)
+
+    def state(self, source, entry):
+        """Classify an entry as 'fresh', 'stale' (servable while revalidating) or 'expired'"""
+        if entry is None:
+            return 'expired'
+        age = time.time() - entry.get('fetched_at', 0)
+        ttl = self.ttls.get(source, self.default_ttl)
+        if age <= ttl:
+            return 'fresh'
+        if age <= ttl + self.stale_ttl:
+            return 'stale'
+        return 'expired'
+
+    def validators(self, entry):
+        """Return conditional request headers for revalidating an entry"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def update(self, source, ticker, entry, response):
+        """Store a fresh response, or refresh the entry's timestamp on 304 Not Modified; return the body"""
+        if response.status_code == 304 and entry is not None:
+            entry = dict(entry, fetched_at=time.time())
+        else:
+            entry = {
+                'url': response.url,
+                'body': response.text,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time()
+            }
+        try:
+            self._write(source, ticker, entry)
+        except OSError as e:
+            print(f"Error writing {source} cache entry for {ticker}: {e}")
+        return entry['body']
+
+    def revalidate_in_background(self, source, ticker, revalidate):
+        """Run revalidate() on a background thread unless one is already in flight for this key"""
+        key = (source, ticker)
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def run():
+            try:
+                revalidate()
+            except Exception as e:
+                print(f"Error revalidating {source} cache entry for {ticker}: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        self._executor.submit(run)
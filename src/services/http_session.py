@@ -0,0 +1,57 @@
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionManager:
+    """Keeps one pooled keep-alive requests session per host"""
+
+    def __init__(self, pool_size=16):
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        session = requests.Session()
+        # requests decodes gzip/deflate bodies transparently; advertise that we accept them
+        session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_session(self, url):
+        """Return the shared session for the host of a URL"""
+        host = urlparse(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+            return session
+
+    def get(self, url, **kwargs):
+        """Issue a GET through the host's pooled session"""
+        return self.get_session(url).get(url, **kwargs)
+
+    def close(self):
+        """Close every pooled session"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+
+def get_session_manager(pool_size=16):
+    """Return the process-wide session manager shared by all scrapers"""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = SessionManager(pool_size=pool_size)
+        return _default_manager
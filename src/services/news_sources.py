@@ -0,0 +1,183 @@
+from abc import ABC, abstractmethod
+from bs4 import BeautifulSoup
+import pandas as pd
+import re
+from datetime import datetime
+
+NEWS_COLUMNS = ['date', 'time', 'headline', 'source']
+
+# Registry of available news sources, keyed by source name
+NEWS_SOURCES = {}
+
+class NewsSourceError(Exception):
+    """Raised when a source's page doesn't have the structure we expect"""
+    pass
+
+def register_news_source(source_class):
+    """Class decorator that makes a news source available to the scraper"""
+    NEWS_SOURCES[source_class.name] = source_class
+    return source_class
+
+class NewsSource(ABC):
+    """Base class for a news source scraped per ticker"""
+    # Short identifier used for the registry, the response cache and logging
+    name = None
+    # Human readable name used in log messages
+    label = None
+    # Host the source is fetched from, and the requests per second and burst size allowed for it
+    host = None
+    rate = 1.0
+    burst = 2
+    enabled = True
+
+    @abstractmethod
+    def build_request(self, ticker, user_agent):
+        """Return the (url, headers) to fetch news for a ticker"""
+
+    @abstractmethod
+    def parse(self, ticker, html):
+        """Parse the fetched page into a DataFrame with NEWS_COLUMNS"""
+
+    async def fetch_news(self, ticker, scraper):
+        """Fetch and parse news for a ticker through the scraper's cache and rate limiter"""
+        url, headers = self.build_request(ticker, scraper.get_random_user_agent())
+        return await scraper.fetch_page(self.name, ticker, url, headers, lambda html: self.parse(ticker, html))
+
+NEWS_TABLE_ID = re.compile(r'id\s*=\s*["\']?news-table["\'\s>]', re.IGNORECASE)
+TABLE_TAG = re.compile(r'<(/?)table\b', re.IGNORECASE)
+
+def extract_table_html(html, id_pattern=NEWS_TABLE_ID):
+    """Return the raw HTML of the <table> whose id matches, or None if it can't be located"""
+    id_match = id_pattern.search(html)
+    if not id_match:
+        return None
+
+    start = html.rfind('<', 0, id_match.start())
+    if start == -1 or not html[start:start + 6].lower() == '<table':
+        return None
+
+    # Walk forward to the matching close tag, allowing for nested tables
+    depth = 0
+    for tag in TABLE_TAG.finditer(html, start):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            end = html.find('>', tag.end())
+            return html[start:] if end == -1 else html[start:end + 1]
+    return html[start:]
+
+@register_news_source
+class FinvizSource(NewsSource):
+    name = 'finviz'
+    label = 'Finviz'
+    host = 'finviz.com'
+    rate = 1.5
+    burst = 3
+
+    # 'fast' parses only the #news-table subtree, 'full' parses the whole quote page
+    PARSE_MODES = ('fast', 'full')
+
+    def __init__(self, parse_mode='fast'):
+        if parse_mode not in self.PARSE_MODES:
+            raise ValueError(f"Unknown Finviz parse mode: {parse_mode}")
+        self.parse_mode = parse_mode
+
+    def build_request(self, ticker, user_agent):
+        url = f'https://finviz.com/quote.ashx?t={ticker}'
+        headers = {
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Cache-Control': 'max-age=0'
+        }
+        return url, headers
+
+    def find_news_table(self, html, mode=None):
+        """Locate the #news-table element, parsing only that subtree in fast mode"""
+        mode = mode or self.parse_mode
+        if mode == 'fast':
+            table_html = extract_table_html(html)
+            if table_html is not None:
+                news_table = BeautifulSoup(table_html, 'html.parser').find(id='news-table')
+                if news_table:
+                    return news_table
+
+        # Full parse, also used when the fast path can't find the table
+        soup = BeautifulSoup(html, 'html.parser')
+        return soup.find(id='news-table')
+
+    def parse(self, ticker, html, mode=None):
+        """Parse the Finviz quote page HTML into a news DataFrame"""
+        news_table = self.find_news_table(html, mode)
+
+        if not news_table:
+            raise NewsSourceError(f"Could not find news table for {ticker} on Finviz")
+
+        news_data = []
+        for row in news_table.find_all('tr'):
+            if not row.td:
+                continue
+
+            date_cell = row.td.text.strip().split() if row.td and row.td.text else ['', '']
+
+            # Handle date format
+            date_str = ''
+            time_str = ''
+
+            if len(date_cell) >= 1:
+                # Check if first element is a date or time
+                if ':' in date_cell[0]:  # It's a time; the date is carried over from the row above
+                    time_str = date_cell[0]
+                else:  # It's a date
+                    date_str = date_cell[0]
+                    if len(date_cell) >= 2:
+                        time_str = date_cell[1]
+
+            # Check if a tag exists before accessing it
+            headline = row.a.text.strip() if row.a else "No headline"
+            source = row.span.text.strip() if row.span else "Unknown"
+
+            news_data.append([date_str, time_str, headline, source])
+
+        df = pd.DataFrame(news_data, columns=NEWS_COLUMNS)
+
+        return df
+
+@register_news_source
+class YahooFinanceSource(NewsSource):
+    name = 'yahoo'
+    label = 'Yahoo Finance'
+    host = 'finance.yahoo.com'
+    rate = 2.0
+    burst = 4
+
+    def build_request(self, ticker, user_agent):
+        url = f'https://finance.yahoo.com/quote/{ticker}/news'
+        headers = {
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5'
+        }
+        return url, headers
+
+    def parse(self, ticker, html):
+        """Parse the Yahoo Finance news page HTML into a news DataFrame"""
+        soup = BeautifulSoup(html, 'html.parser')
+        news_items = soup.select('li.js-stream-content')
+
+        if not news_items:
+            raise NewsSourceError(f"Could not find news stream for {ticker} on Yahoo Finance")
+
+        news_data = []
+        for item in news_items:
+            headline_elem = item.select_one('h3')
+            time_elem = item.select_one('span[data-reactid]')
+
+            if headline_elem and time_elem:
+                headline = headline_elem.text.strip()
+                timestamp = time_elem.text.strip()
+                news_data.append([datetime.now().strftime('%m/%d/%y'), timestamp, headline, 'Yahoo Finance'])
+
+        df = pd.DataFrame(news_data, columns=NEWS_COLUMNS)
+        return df
@@ -1,12 +1,30 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import pandas as pd
 import random
-import time
+import requests
+from view.circuit_breaker import CircuitBreaker, CircuitOpenError
+from view.fetch_engine import AsyncFetcher
+from view.http_cache import ResponseCache
+from view.news_sources import NEWS_SOURCES, NewsSourceError
 
 class ScraperService:
-    def __init__(self):
-        pass
+    def __init__(self, fetcher=None, cache=None, sources=None, source_options=None):
+        # Instantiate every enabled registered source unless an explicit list is given;
+        # source_options maps a source name to its constructor kwargs, e.g. {'finviz': {'parse_mode': 'full'}}
+        if sources is None:
+            source_options = source_options or {}
+            sources = [
+                source_class(**source_options.get(name, {}))
+                for name, source_class in NEWS_SOURCES.items()
+                if source_class.enabled
+            ]
+        self.sources = {source.name: source for source in sources}
+        self.breakers = {name: CircuitBreaker() for name in self.sources}
+        
+        # Each source declares its own politeness limits for its host
+        host_limits = {source.host: (source.rate, source.burst) for source in self.sources.values()}
+        self.fetcher = fetcher or AsyncFetcher(host_limits=host_limits)
+        self.cache = cache or ResponseCache()
     
     def get_random_user_agent(self):
         """Return a random user agent to avoid detection"""
@@ -24,99 +42,161 @@ class ScraperService:
     
     def scrape_finviz_news(self, ticker):
         """Scrape news headlines for a specific ticker from Finviz"""
-        url = f'https://finviz.com/quote.ashx?t={ticker}'
-        headers = {
-            'User-Agent': self.get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0'
-        }
+        return self.fetcher.run(self.scrape_source_async('finviz', ticker))
+    
+    def scrape_yahoo_finance_news(self, ticker):
+        """Scrape news from Yahoo Finance for a specific ticker"""
+        return self.fetcher.run(self.scrape_source_async('yahoo', ticker))
+    
+    def scrape_ticker_news(self, ticker, sources=None):
+        """Scrape all enabled news sources for a ticker concurrently and combine them"""
+        return self.fetcher.run(self.scrape_ticker_news_async(ticker, sources))
+    
+    def scrape_news_many(self, tickers, sources=None):
+        """Scrape all enabled news sources for many tickers concurrently, keyed by ticker"""
+        return self.fetcher.run(self.scrape_news_many_async(tickers, sources))
+    
+    def iter_ticker_news(self, ticker, sources=None):
+        """Yield each source's news frame for a ticker as soon as that source finishes"""
+        loop = asyncio.new_event_loop()
+        pending = set()
+        try:
+            pending = {loop.create_task(self.scrape_source_async(name, ticker)) for name in (sources or self.sources)}
+            while pending:
+                done, pending = loop.run_until_complete(asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))
+                for task in done:
+                    yield task.result()
+        finally:
+            # The consumer may stop early; cancel whatever is still in flight before closing the loop
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+    
+    async def scrape_source_async(self, source_name, ticker):
+        """Fetch and parse one source's news for a ticker, returning an empty frame on failure"""
+        source = self.sources.get(source_name)
+        if source is None:
+            return pd.DataFrame()
         
         try:
-            # Add a delay to avoid being blocked
-            time.sleep(random.uniform(1, 2))
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            news_table = soup.find(id='news-table')
-            
-            if not news_table:
-                print(f"Warning: Could not find news table for {ticker} on Finviz")
-                return pd.DataFrame()
-                
-            news_data = []
-            for row in news_table.find_all('tr'):
-                if not row.td:
-                    continue
-                    
-                date_cell = row.td.text.strip().split() if row.td and row.td.text else ['', '']
-                
-                # Handle date format
-                date_str = ''
-                time_str = ''
-                
-                if len(date_cell) >= 1:
-                    # Check if first element is a date or time
-                    if ':' in date_cell[0]:  # It's a time
-                        time_str = date_cell[0]
-                        from datetime import datetime
-                        date_str = datetime.now().strftime('%m/%d/%y')
-                    else:  # It's a date
-                        date_str = date_cell[0]
-                        if len(date_cell) >= 2:
-                            time_str = date_cell[1]
-                
-                # Check if a tag exists before accessing it
-                headline = row.a.text.strip() if row.a else "No headline"
-                source = row.span.text.strip() if row.span else "Unknown"
-                
-                news_data.append([date_str, time_str, headline, source])
-            
-            df = pd.DataFrame(news_data, columns=['date', 'time', 'headline', 'source'])
-            
-            return df
+            return await source.fetch_news(ticker, self)
+        
+        except CircuitOpenError:
+            # The source is failing and this ticker has no usable cached page
+            return pd.DataFrame()
         
         except Exception as e:
-            print(f"Error scraping {ticker} news from Finviz: {e}")
+            print(f"Error scraping {ticker} news from {source.label}: {e}")
             return pd.DataFrame()
     
-    def scrape_yahoo_finance_news(self, ticker):
-        """Scrape news from Yahoo Finance for a specific ticker"""
-        url = f'https://finance.yahoo.com/quote/{ticker}/news'
-        headers = {
-            'User-Agent': self.get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5'
-        }
-        
+    def get_retry_after(self, error):
+        """Return the Retry-After seconds from a throttled HTTP error, if any"""
+        if not isinstance(error, requests.HTTPError) or error.response is None:
+            return None
         try:
-            # Add a delay to avoid being blocked
-            time.sleep(random.uniform(1, 2))
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            news_items = soup.select('li.js-stream-content')
-            
-            news_data = []
-            for item in news_items:
-                headline_elem = item.select_one('h3')
-                time_elem = item.select_one('span[data-reactid]')
-                
-                if headline_elem and time_elem:
-                    headline = headline_elem.text.strip()
-                    timestamp = time_elem.text.strip()
-                    from datetime import datetime
-                    news_data.append([datetime.now().strftime('%m/%d/%y'), timestamp, headline, 'Yahoo Finance'])
+            return float(error.response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+    
+    def get_source_health(self):
+        """Return the circuit breaker state of every source"""
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+    
+    async def scrape_ticker_news_async(self, ticker, sources=None):
+        """Query every source for a ticker at once and merge the results"""
+        source_names = list(sources or self.sources)
+        frames = await self.fetcher.gather([self.scrape_source_async(name, ticker) for name in source_names])
+        return self.merge_news(frames)
+    
+    async def scrape_news_many_async(self, tickers, sources=None):
+        """Fan out over every ticker and source at once, paced by the per-host limits"""
+        tickers = list(tickers)
+        source_names = list(sources or self.sources)
+        coroutines = [self.scrape_source_async(name, ticker) for ticker in tickers for name in source_names]
+        frames = await self.fetcher.gather(coroutines)
+        
+        results = {}
+        for i, ticker in enumerate(tickers):
+            results[ticker] = self.merge_news(frames[i * len(source_names):(i + 1) * len(source_names)])
+        return results
+    
+    def merge_news(self, frames):
+        """Combine per-source news frames into one"""
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames).reset_index(drop=True)
+    
+    async def fetch_page(self, source, ticker, url, headers, parse=None):
+        """Return page HTML from the response cache, revalidating or fetching it as needed
+        
+        With parse given, return parse(html) instead. A NewsSourceError raised while parsing a
+        freshly fetched page counts as a failure of the source (e.g. its markup changed); one
+        raised for a page served from the cache doesn't touch the breaker.
+        """
+        parse = parse or (lambda html: html)
+        entry = self.cache.load(source, ticker)
+        state = self.cache.state(source, entry)
+        
+        if state == 'fresh':
+            return parse(entry['body'])
+        
+        # Cache hits never touch the breaker; only real upstream calls are gated and counted
+        breaker = self.breakers[source]
+        
+        if state == 'stale':
+            # Serve the stale copy now and refresh it off the request path
+            def revalidate():
+                if breaker.is_open():
+                    return
+                self.fetcher.wait_turn_blocking(url)
+                if not breaker.allow():
+                    return
+                try:
+                    response = self.fetcher.send_blocking(url, {**headers, **self.cache.validators(entry)})
+                except Exception as e:
+                    breaker.record_failure(e, retry_after=self.get_retry_after(e))
+                    raise
+                try:
+                    parse(self.cache.update(source, ticker, entry, response))
+                except NewsSourceError as e:
+                    breaker.record_failure(e)
+                    raise
+                breaker.record_success()
             
-            df = pd.DataFrame(news_data, columns=['date', 'time', 'headline', 'source'])
-            return df
+            self.cache.revalidate_in_background(source, ticker, revalidate)
+            return parse(entry['body'])
+        
+        # Skip a source whose circuit is open instead of waiting on it to fail again. The breaker
+        # is consulted again once the rate limit lets this call through, and queued calls give up
+        # as soon as it opens, so a fan-out stops after failure_threshold upstream failures
+        if breaker.is_open() or not await self.fetcher.wait_turn(url, abandon=breaker.is_open) or not breaker.allow():
+            raise CircuitOpenError(f"Circuit for {source} is open")
+        
+        try:
+            response = await self.fetcher.send(url, {**headers, **self.cache.validators(entry)})
+        
+        except asyncio.CancelledError:
+            # Abandoned (e.g. a streaming client went away): neither a success nor a failure,
+            # but a half-open probe must be released or the source stays disabled
+            breaker.release_probe()
+            raise
         
         except Exception as e:
-            print(f"Error scraping Yahoo Finance news for {ticker}: {e}")
-            return pd.DataFrame()
\ No newline at end of file
+            breaker.record_failure(e, retry_after=self.get_retry_after(e))
+            raise
+        
+        try:
+            result = parse(self.cache.update(source, ticker, entry, response))
+        except NewsSourceError as e:
+            breaker.record_failure(e)
+            raise
+        except Exception:
+            # Not the source's fault; don't leave a half-open probe claimed
+            breaker.release_probe()
+            raise
+        
+        breaker.record_success()
+        return result
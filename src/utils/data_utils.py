@@ -1,9 +1,114 @@
 import json
 import os
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+# Absolute date formats seen in scraped news, tried in order
+NEWS_DATE_FORMATS = ['%b-%d-%y', '%m/%d/%y', '%m/%d/%Y', '%Y-%m-%d']
+
+# Units accepted in relative dates such as "3 hours ago"
+AGO_UNITS = {
+    'min': pd.Timedelta(minutes=1), 'minute': pd.Timedelta(minutes=1),
+    'hr': pd.Timedelta(hours=1), 'hour': pd.Timedelta(hours=1),
+    'day': pd.Timedelta(days=1), 'week': pd.Timedelta(weeks=1)
+}
+
+# Columns of news_details returned in the compact columnar format unless fields= picks others
+COMPACT_NEWS_FIELDS = ['date', 'time', 'headline', 'source', 'compound', 'category', 'parsed_date']
+
 class DataUtils:
+    @staticmethod
+    def parse_fields(fields_param):
+        """Split a fields= query value like 'avg_sentiment,news_details.headline' into selections
+        
+        Returns (top_fields, news_fields): top-level result keys to keep and news_details
+        columns to keep, each None when not restricted.
+        """
+        if not fields_param:
+            return None, None
+        
+        top_fields = []
+        news_fields = []
+        for field in fields_param.split(','):
+            field = field.strip()
+            if not field:
+                continue
+            if field.startswith('news_details.'):
+                news_fields.append(field[len('news_details.'):])
+                field = 'news_details'
+            if field not in top_fields:
+                top_fields.append(field)
+        return top_fields, news_fields or None
+    
+    @staticmethod
+    def frame_to_columns(df, fields=None):
+        """Convert a DataFrame into one JSON-ready list per column"""
+        if fields is not None:
+            df = df[[field for field in fields if field in df.columns]]
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                columns[column] = series.dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+            else:
+                columns[column] = series.tolist()
+        return columns
+    
+    @staticmethod
+    def json_default(value):
+        """json.dumps fallback for the numpy scalars and timestamps found in DataFrame records"""
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        if hasattr(value, 'item'):
+            return value.item()
+        return str(value)
+    
+    @staticmethod
+    def normalize_news_dates(news_df, now=None):
+        """Parse the 'date' column of scraped news into timestamps, vectorized over the whole frame"""
+        now = pd.Timestamp(now or datetime.now())
+        if news_df.empty:
+            return pd.Series([], dtype='datetime64[ns]', index=news_df.index)
+        
+        dates = news_df['date'].fillna('').astype(str).str.strip()
+        lowered = dates.str.lower()
+        parsed = pd.Series(pd.NaT, index=news_df.index, dtype='datetime64[ns]')
+        
+        for date_format in NEWS_DATE_FORMATS:
+            unparsed = parsed.isna() & (dates != '')
+            if not unparsed.any():
+                break
+            parsed[unparsed] = pd.to_datetime(dates[unparsed], format=date_format, errors='coerce')
+        
+        parsed[lowered == 'today'] = now
+        parsed[lowered == 'yesterday'] = now - pd.Timedelta(days=1)
+        
+        ago = lowered.str.extract(r'(\d+)\s*(min|minute|hr|hour|day|week)s?\s+ago')
+        for unit, unit_delta in AGO_UNITS.items():
+            mask = ago[1] == unit
+            if mask.any():
+                parsed[mask] = now - ago.loc[mask, 0].astype(int) * unit_delta
+        
+        # Unparsable dates count as now before the carry-forward below, so the time-only
+        # rows after them take today rather than an older date from further up
+        parsed[parsed.isna() & (dates != '')] = now
+        
+        # Finviz only prints the date on the first headline of each day, so
+        # time-only rows inherit the last date seen above them
+        if 'time' in news_df.columns:
+            time_only = (dates == '') & news_df['time'].fillna('').astype(str).str.contains(':')
+            if time_only.any():
+                parsed[time_only] = parsed.ffill()[time_only]
+        
+        # Anything still unparsed (including empty dates) counts as now
+        return parsed.fillna(now)
+    
+    @staticmethod
+    def price_points(dates, prices):
+        """Pair formatted dates with prices rounded to cents"""
+        return [{"date": date, "price": price} for date, price in zip(dates, np.round(prices, 2).tolist())]
+    
     @staticmethod
     def export_stock_data_to_json(ticker, name, price_data, prediction_data, sentiment_score, investment_score):
         """Export stock data to JSON for Vue component consumption"""
@@ -20,26 +125,11 @@ class DataUtils:
                     "price": round(row['Close'], 2)
                 })
             
-            # Create prediction data
-            prediction_series = []
-            for date, price in prediction_data.iterrows():
-                prediction_series.append({
-                    "date": date.strftime('%Y-%m-%d'),
-                    "price": round(price['Price'], 2)
-                })
-            
-            # Create upper and lower bounds for prediction uncertainty
-            upper_bound = []
-            lower_bound = []
-            for date, price in prediction_data.iterrows():
-                upper_bound.append({
-                    "date": date.strftime('%Y-%m-%d'),
-                    "price": round(price['Price'] * 1.10, 2)  # 10% upper bound
-                })
-                lower_bound.append({
-                    "date": date.strftime('%Y-%m-%d'),
-                    "price": round(price['Price'] * 0.90, 2)  # 10% lower bound
-                })
+            # Create prediction data, with the simulated quantile bands for prediction uncertainty
+            prediction_dates = prediction_data.index.strftime('%Y-%m-%d')
+            prediction_series = DataUtils.price_points(prediction_dates, prediction_data['Price'])
+            upper_bound = DataUtils.price_points(prediction_dates, prediction_data['Upper'])
+            lower_bound = DataUtils.price_points(prediction_dates, prediction_data['Lower'])
             
             # Prepare sentiment category
             sentiment_category = 'Bullish' if sentiment_score > 0.05 else ('Bearish' if sentiment_score < -0.05 else 'Neutral')
@@ -79,20 +169,16 @@ class DataUtils:
     def generate_master_stocks_json(ranked_stocks):
         """Generate a master JSON file with all analyzed stocks"""
         try:
-            stocks_list = []
-            
-            for _, row in ranked_stocks.iterrows():
-                ticker = row['ticker']
-                stock_data = {
-                    "ticker": ticker,
-                    "name": row['name'],
-                    "investment_score": round(row['investment_score'], 1),
-                    "sentiment_category": row['sentiment_category'],
-                    "sentiment_score": round(row['avg_sentiment'], 2),
-                    "rank": int(row['rank']),
-                    "data_file": f"{ticker}_data.json"
-                }
-                stocks_list.append(stock_data)
+            # Build every column at once rather than row by row
+            stocks_list = pd.DataFrame({
+                "ticker": ranked_stocks['ticker'],
+                "name": ranked_stocks['name'],
+                "investment_score": ranked_stocks['investment_score'].astype(float).round(1),
+                "sentiment_category": ranked_stocks['sentiment_category'],
+                "sentiment_score": ranked_stocks['avg_sentiment'].astype(float).round(2),
+                "rank": ranked_stocks['rank'].astype(int),
+                "data_file": ranked_stocks['ticker'].astype(str) + "_data.json"
+            }).to_dict('records')
             
             # Create master JSON
             master_data = {
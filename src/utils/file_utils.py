@@ -0,0 +1,31 @@
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+
+def safe_ticker_path(directory, ticker, extension):
+    """Return <directory>/<TICKER>.<extension>, with characters unsafe in file names replaced"""
+    safe_ticker = re.sub(r'[^A-Za-z0-9._-]', '_', ticker.upper())
+    return os.path.join(directory, f'{safe_ticker}.{extension}')
+
+
+@contextmanager
+def atomic_write(path, mode='w', encoding=None):
+    """Open a temporary file next to path and move it over path once the block succeeds
+
+    Readers only ever see the old or the new file, never a partial one. The temporary
+    name is unique per process and thread and keeps path's extension, so concurrent
+    writers don't collide and tools like np.save don't append their own.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    extension = os.path.splitext(path)[1]
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp{extension}'
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
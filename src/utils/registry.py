@@ -0,0 +1,38 @@
+import gc
+from flask import current_app
+from model.sentiment_model import SentimentModel
+from model.stock_model import StockModel
+from view.scraper_service import ScraperService
+from utils.data_utils import DataUtils
+from utils.report_writer import ReportWriter
+
+class ModelRegistry:
+    """Owns the one shared instance of each engine used by the blueprints"""
+
+    EXTENSION_NAME = 'vestra'
+
+    def __init__(self, sentiment_model=None, scraper_service=None, stock_model=None, data_utils=None,
+                 report_writer=None):
+        self.sentiment_model = sentiment_model or SentimentModel()
+        self.scraper_service = scraper_service or ScraperService()
+        self.stock_model = stock_model or StockModel()
+        self.data_utils = data_utils or DataUtils()
+        # Writes ranking reports off the request thread
+        self.report_writer = report_writer or ReportWriter(self.stock_model)
+
+    def init_app(self, app):
+        """Attach the registry to a Flask app so blueprints can reach it through current_app"""
+        app.extensions[self.EXTENSION_NAME] = self
+
+    def freeze(self):
+        """Move everything loaded so far out of the garbage collector's reach before workers fork
+
+        Objects in the permanent generation are never traversed by the collector, so forked
+        workers keep sharing the lexicon pages copy-on-write instead of dirtying them.
+        """
+        gc.collect()
+        gc.freeze()
+
+def get_registry():
+    """Return the registry of the current Flask app"""
+    return current_app.extensions[ModelRegistry.EXTENSION_NAME]
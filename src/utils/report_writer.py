@@ -0,0 +1,88 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.data_utils import DataUtils
+from utils.file_utils import atomic_write
+
+METHODOLOGY = (
+    "\n## Methodology\n\n"
+    "This ranking is based on sentiment analysis of recent news articles for each stock. "
+    "The investment score (0-100) combines sentiment analysis with price momentum indicators. "
+    "A higher score suggests a more favorable investment opportunity based on current market sentiment and momentum.\n\n"
+    "**Note**: This analysis should be used as one factor in investment decisions, not as a sole determining factor. "
+    "Always conduct thorough research and consider consulting with a financial advisor before making investment decisions.\n"
+)
+
+
+def render_ranking_markdown(ranked_df, generated_at=None):
+    """Render a ranked frame (see StockModel.rank_stocks_by_investment_potential) as the Markdown report"""
+    generated_at = generated_at or datetime.now()
+    buffer = io.StringIO()
+    buffer.write("# Investment Potential Ranking Based on Sentiment Analysis\n\n")
+    buffer.write(f"Analysis Date: {generated_at.strftime('%Y-%m-%d %H:%M')}\n\n")
+
+    # Top 10 recommendations, each formatted as whole columns rather than row by row
+    buffer.write("## Top 10 Investment Recommendations\n\n")
+    top10 = ranked_df.head(10)
+    recommendations = (
+        top10['rank'].astype(str) + ". **" + top10['ticker'].astype(str) + "** (" + top10['name'].astype(str) + ")\n"
+        + "   - Investment Score: " + top10['investment_score'].map('{:.1f}'.format) + "/100\n"
+        + "   - Sentiment: " + top10['sentiment_category'].astype(str)
+        + " (" + top10['avg_sentiment'].map('{:.2f}'.format) + ")\n"
+        + "   - Based on " + top10['news_count'].astype(str) + " news articles\n\n"
+    )
+    buffer.writelines(recommendations)
+
+    # Complete ranking as a Markdown table
+    buffer.write("## Complete Ranking\n\n")
+    buffer.write("| Rank | Ticker | Company | Investment Score | Sentiment | News Count |\n")
+    buffer.write("|------|--------|---------|-----------------|-----------|------------|\n")
+    table_rows = (
+        "| " + ranked_df['rank'].astype(str)
+        + " | " + ranked_df['ticker'].astype(str)
+        + " | " + ranked_df['name'].astype(str)
+        + " | " + ranked_df['investment_score'].round(1).astype(str)
+        + " | " + ranked_df['sentiment_category'].astype(str)
+        + " | " + ranked_df['news_count'].astype(str) + " |\n"
+    )
+    buffer.writelines(table_rows)
+
+    buffer.write(METHODOLOGY)
+    return buffer.getvalue()
+
+
+class ReportWriter:
+    """Renders and writes the ranking reports and master JSON on a single background thread"""
+
+    def __init__(self, stock_model, report_dir='reports'):
+        self.stock_model = stock_model
+        self.report_dir = report_dir
+        # One worker keeps writes in submission order; the thread starts on the first submit
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report-writer')
+
+    def submit(self, results_list):
+        """Queue a full ranking of results_list to be written, returning a Future"""
+        return self._executor.submit(self.write, results_list)
+
+    def write(self, results_list):
+        """Rank results_list and write the Markdown report, the CSV and the master JSON"""
+        try:
+            ranked_df = self.stock_model.rank_stocks_by_investment_potential(results_list)
+            with atomic_write(os.path.join(self.report_dir, 'investment_ranking_report.md')) as f:
+                f.write(render_ranking_markdown(ranked_df))
+
+            # Also save as CSV for easier data analysis
+            with atomic_write(os.path.join(self.report_dir, 'investment_ranking.csv')) as f:
+                ranked_df.to_csv(f, index=False)
+
+            DataUtils.generate_master_stocks_json(ranked_df)
+            return ranked_df
+        except Exception as e:
+            print(f"Error writing ranking reports: {e}")
+            return None
+
+    def flush(self):
+        """Block until every queued report has been written"""
+        self._executor.submit(lambda: None).result()
@@ -0,0 +1,19 @@
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The backend imports the src/ folders under these package names
+PACKAGE_DIRS = {
+    'model': os.path.join(ROOT, 'src', 'models'),
+    'view': os.path.join(ROOT, 'src', 'services'),
+    'utils': os.path.join(ROOT, 'src', 'utils'),
+    'controller': os.path.join(ROOT, 'src', 'controllers')
+}
+
+for name, path in PACKAGE_DIRS.items():
+    if name not in sys.modules:
+        package = types.ModuleType(name)
+        package.__path__ = [path]
+        sys.modules[name] = package
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from utils.file_utils import atomic_write, safe_ticker_path
+
+
+def test_safe_ticker_path():
+    assert safe_ticker_path('prices', 'brk.b', 'npy') == os.path.join('prices', 'BRK.B.npy')
+    assert safe_ticker_path('cache', '../etc/passwd', 'json') == os.path.join('cache', '.._ETC_PASSWD.json')
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / 'nested' / 'report.md')
+    with atomic_write(path) as f:
+        f.write('first')
+    with atomic_write(path) as f:
+        f.write('second')
+
+    with open(path) as f:
+        assert f.read() == 'second'
+    assert os.listdir(tmp_path / 'nested') == ['report.md']
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / 'state.json')
+    with atomic_write(path) as f:
+        f.write('old')
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write('partial')
+            raise RuntimeError('interrupted')
+
+    with open(path) as f:
+        assert f.read() == 'old'
+    assert os.listdir(tmp_path) == ['state.json']
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from view.news_sources import FinvizSource, NewsSourceError, extract_table_html
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'finviz')
+
+PAGES = ['normal.html', 'nested_tables.html', 'unquoted_id.html', 'single_quoted_id.html']
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', PAGES)
+def test_fast_path_locates_table(name):
+    table_html = extract_table_html(read_fixture(name))
+    assert table_html is not None
+    assert table_html.lower().startswith('<table')
+    assert table_html.lower().endswith('</table>')
+
+
+@pytest.mark.parametrize('name', PAGES)
+def test_fast_and_full_parse_agree(name):
+    source = FinvizSource()
+    html = read_fixture(name)
+
+    fast = source.parse('TEST', html, mode='fast')
+    full = source.parse('TEST', html, mode='full')
+
+    assert not fast.empty
+    assert fast.columns.tolist() == full.columns.tolist()
+    assert fast.values.tolist() == full.values.tolist()
+
+
+def test_parses_rows():
+    news_df = FinvizSource().parse('AAPL', read_fixture('normal.html'), mode='fast')
+
+    assert news_df.values.tolist()[:3] == [
+        ['Oct-17-26', '09:30AM', 'Apple beats estimates as iPhone sales surge', '(Reuters)'],
+        ['', '08:15AM', 'Analysts upgrade Apple to buy on services growth', '(Barrons.com)'],
+        ['Oct-16-26', '04:05PM', 'Apple & Google face new antitrust probe', '(Bloomberg)']
+    ]
+    assert news_df.values.tolist()[-1] == ['Oct-15-26', '11:20AM', 'No headline', 'Unknown']
+
+
+@pytest.mark.parametrize('mode', FinvizSource.PARSE_MODES)
+def test_missing_table_raises(mode):
+    with pytest.raises(NewsSourceError):
+        FinvizSource().parse('ZZZZ', read_fixture('missing_table.html'), mode=mode)
+
+
+def test_unknown_parse_mode():
+    with pytest.raises(ValueError):
+        FinvizSource(parse_mode='lxml')
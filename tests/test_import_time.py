@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Generous bound: importing pandas and numpy dominates, NLTK must not be loaded at all
+MAX_IMPORT_SECONDS = 10
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {tests_dir!r})
+import conftest
+start = time.perf_counter()
+import model.sentiment_model
+import model.lexicon_scorer
+elapsed = time.perf_counter() - start
+nltk_loaded = sorted(name for name in sys.modules if name == 'nltk' or name.startswith('nltk.'))
+from model.lexicon_store import build_analyzer
+compound = build_analyzer().polarity_scores('Analysts upgrade the stock, bullish outlook')['compound']
+print(json.dumps({{'elapsed': elapsed, 'nltk_loaded': nltk_loaded, 'compound': compound}}))
+"""
+
+
+def run_probe(tmp_path):
+    # No NLTK data in HOME, downloads disabled and proxies pointing nowhere, so any network use fails
+    env = dict(
+        os.environ,
+        HOME=str(tmp_path),
+        NLTK_DATA=str(tmp_path),
+        VESTRA_OFFLINE='1',
+        HTTP_PROXY='http://127.0.0.1:9',
+        HTTPS_PROXY='http://127.0.0.1:9'
+    )
+    env.pop('VESTRA_LEXICON_DIR', None)
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(tests_dir=TESTS_DIR)],
+        env=env, cwd=str(tmp_path), capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_nltk(tmp_path):
+    report = run_probe(tmp_path)
+    assert report['nltk_loaded'] == []
+    assert report['elapsed'] < MAX_IMPORT_SECONDS
+
+
+def test_analyzer_builds_offline_from_committed_snapshot(tmp_path):
+    report = run_probe(tmp_path)
+    assert report['compound'] > 0
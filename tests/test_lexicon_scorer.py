@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from model.lexicon_scorer import CompiledLexiconScorer, compare_with_vader
+from model.lexicon_store import build_analyzer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    try:
+        return build_analyzer()
+    except LookupError:
+        pytest.skip("No lexicon snapshot and no NLTK vader_lexicon available")
+
+
+@pytest.fixture(scope='module')
+def scorer(analyzer):
+    return CompiledLexiconScorer(analyzer.lexicon)
+
+
+@pytest.fixture(scope='module')
+def headlines():
+    with open(os.path.join(FIXTURES, 'headlines.txt'), 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('strong!!!', ['strong']),
+    ('bullish???', ['bullish']),
+    ('"buy"', ['buy']),
+    ('(upgrade),', ['upgrade']),
+    (':) :-( A.', [':)', ':-(', 'A.']),
+    ("don't stop", ["don't", 'stop']),
+    ('a b', [])
+])
+def test_tokenize_strips_punctuation_like_vader(scorer, text, expected):
+    assert scorer.tokenize(text) == expected
+
+
+def test_punctuated_words_are_scored(scorer):
+    assert scorer.polarity_scores('Amazon posts strong!!! quarter')['compound'] > 0
+    assert scorer.polarity_scores('Is Intel still bullish???')['compound'] > 0
+    assert scorer.polarity_scores('Nvidia stock is a "buy"')['compound'] > 0
+
+
+def test_agrees_with_vader_within_tolerance(scorer, analyzer, headlines):
+    report = compare_with_vader(scorer, analyzer, headlines, tolerance=0.1)
+    assert report['texts'] == len(headlines)
+    assert report['agreement'] >= 0.9
+    assert report['mean_difference'] < 0.05
+
+
+def test_faster_than_vader(scorer, analyzer, headlines):
+    report = compare_with_vader(scorer, analyzer, headlines * 50)
+    print(f"compiled {report['compiled_seconds']:.4f}s, vader {report['vader_seconds']:.4f}s, "
+          f"speedup {report['speedup']:.1f}x")
+    assert report['compiled_seconds'] < report['vader_seconds']
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from utils.data_utils import DataUtils
+
+NOW = pd.Timestamp('2026-10-18 12:00')
+
+
+def normalize(rows):
+    return DataUtils.normalize_news_dates(pd.DataFrame(rows, columns=['date', 'time']), NOW).tolist()
+
+
+def test_time_only_rows_inherit_the_date_above():
+    assert normalize([['Sep-30-26', '09:00AM'], ['', '08:00AM'], ['Today', '07:00AM'], ['', '06:00AM']]) == [
+        pd.Timestamp('2026-09-30'), pd.Timestamp('2026-09-30'), NOW, NOW
+    ]
+
+
+def test_unparsable_date_breaks_the_carry_forward():
+    assert normalize([['Sep-30-26', '09:00AM'], ['Just now', '08:00AM'], ['', '07:00AM']]) == [
+        pd.Timestamp('2026-09-30'), NOW, NOW
+    ]
+
+
+def test_relative_and_missing_dates():
+    assert normalize([['2 hours ago', ''], ['', '']]) == [NOW - pd.Timedelta(hours=2), NOW]
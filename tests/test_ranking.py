@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from model.price_store import PriceStore
+from model.stock_model import RANKING_COLUMNS, StockModel
+
+
+@pytest.fixture
+def stock_model(tmp_path):
+    return StockModel(prices=PriceStore(str(tmp_path / 'prices')))
+
+
+def make_results(scores):
+    return [
+        dict({column: None for column in RANKING_COLUMNS}, ticker=f'T{i}', investment_score=score)
+        for i, score in enumerate(scores)
+    ]
+
+
+def test_ties_keep_input_order(stock_model):
+    ranked_df = stock_model.rank_stocks_by_investment_potential(make_results([50, 60, 60, 60, 60, 40, 60, 70]))
+    assert ranked_df['ticker'].tolist()[:4] == ['T7', 'T1', 'T2', 'T3']
+    assert ranked_df['rank'].tolist() == list(range(1, 9))
+
+
+@pytest.mark.parametrize('scores', [
+    [50, 60, 60, 60, 60, 40, 60, 70, 50, 100, 100],
+    [50] * 12,
+    [100, np.nan, 50, 100, np.nan, 50, 70]
+])
+def test_top_k_matches_the_full_ranking(stock_model, scores):
+    full = stock_model.rank_stocks_by_investment_potential(make_results(scores))['ticker'].tolist()
+    for top_k in range(len(scores) + 1):
+        top = stock_model.rank_stocks_by_investment_potential(make_results(scores), top_k=top_k)
+        assert top['ticker'].tolist() == full[:top_k]
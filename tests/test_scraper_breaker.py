@@ -0,0 +1,89 @@
+import os
+import time
+
+import requests
+
+from view.fetch_engine import AsyncFetcher
+from view.http_cache import ResponseCache
+from view.scraper_service import ScraperService
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'finviz')
+
+
+class StubSessionManager:
+    """Answers every request with a fixed status and body, recording the URLs requested"""
+
+    def __init__(self, status_code, body=b''):
+        self.status_code = status_code
+        self.body = body
+        self.urls = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.urls.append(url)
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.url = url
+        response._content = self.body
+        return response
+
+
+def make_scraper(tmp_path, session_manager):
+    scraper = ScraperService(cache=ResponseCache(str(tmp_path / 'http')))
+    host_limits = {source.host: (source.rate, source.burst) for source in scraper.sources.values()}
+    scraper.fetcher = AsyncFetcher(host_limits=host_limits, session_manager=session_manager)
+    return scraper
+
+
+def test_queued_calls_stop_once_the_circuit_opens(tmp_path):
+    session_manager = StubSessionManager(429)
+    scraper = make_scraper(tmp_path, session_manager)
+    breaker = scraper.breakers['finviz']
+
+    start = time.monotonic()
+    results = scraper.scrape_news_many([f'T{i}' for i in range(10)], sources=['finviz'])
+
+    assert all(news_df.empty for news_df in results.values())
+    assert len(session_manager.urls) == breaker.failure_threshold
+    assert breaker.snapshot()['state'] == 'open'
+    # The remaining tickers give up instead of sitting out the rate limit
+    assert time.monotonic() - start < 1.5
+
+
+def test_cached_page_is_served_while_the_circuit_is_open(tmp_path):
+    scraper = make_scraper(tmp_path, StubSessionManager(503))
+    with open(os.path.join(FIXTURES, 'normal.html'), 'rb') as f:
+        cached = StubSessionManager(200, f.read()).get('https://finviz.com/quote.ashx?t=AAPL')
+    scraper.cache.update('finviz', 'AAPL', None, cached)
+
+    breaker = scraper.breakers['finviz']
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    assert not scraper.scrape_finviz_news('AAPL').empty
+    assert scraper.scrape_finviz_news('MSFT').empty
+    assert breaker.snapshot()['state'] == 'open'
+
+
+def test_unparsable_fresh_pages_open_the_circuit(tmp_path):
+    session_manager = StubSessionManager(200, b'<html><body><p>New layout</p></body></html>')
+    scraper = make_scraper(tmp_path, session_manager)
+    breaker = scraper.breakers['yahoo']
+
+    for i in range(breaker.failure_threshold):
+        assert scraper.scrape_yahoo_finance_news(f'T{i}').empty
+
+    health = scraper.get_source_health()['yahoo']
+    assert health['state'] == 'open'
+    assert health['failures'] == breaker.failure_threshold
+    assert 'news stream' in health['last_error']
+
+
+def test_unparsable_cached_page_does_not_count(tmp_path):
+    scraper = make_scraper(tmp_path, StubSessionManager(503))
+    broken = StubSessionManager(200, b'<html></html>').get('https://finance.yahoo.com/quote/AAPL')
+    scraper.cache.update('yahoo', 'AAPL', None, broken)
+
+    for _ in range(5):
+        assert scraper.scrape_yahoo_finance_news('AAPL').empty
+
+    assert scraper.get_source_health()['yahoo']['failures'] == 0
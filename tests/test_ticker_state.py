@@ -0,0 +1,24 @@
+from model.headline_index import HeadlineIndex
+from model.sentiment_aggregates import DecayedSentimentAggregator
+
+
+def test_aggregate_state_ignores_ticker_case(tmp_path):
+    aggregates = DecayedSentimentAggregator(str(tmp_path), lexicon_version='v1')
+
+    assert aggregates.update('aapl', ['k1'], [0.5], ['Bullish'], [0], now=1000) == 1
+    assert aggregates.update('AAPL', ['k1', 'k2'], [0.5, -0.5], ['Bullish', 'Bearish'], [0, 0], now=1000) == 1
+    assert aggregates.get('Aapl', now=1000)['weight'] == 2
+
+    reloaded = DecayedSentimentAggregator(str(tmp_path), lexicon_version='v1')
+    assert reloaded.update('AAPL', ['k1', 'k2'], [0.5, -0.5], ['Bullish', 'Bearish'], [0, 0], now=1000) == 0
+    assert [path.name for path in tmp_path.iterdir()] == ['AAPL.json']
+
+
+def test_headline_index_ignores_ticker_case(tmp_path):
+    index = HeadlineIndex(str(tmp_path), lexicon_version='v1')
+
+    index.add('msft', {'k1': [0, 1, 0, 0]})
+    index.add('MSFT', {'k2': [0, 0, 1, 0.5]})
+
+    assert index.lookup('Msft', ['k1', 'k2']) == {'k1': [0, 1, 0, 0], 'k2': [0, 0, 1, 0.5]}
+    assert HeadlineIndex(str(tmp_path), lexicon_version='v1').lookup('msft', ['k1', 'k2']).keys() == {'k1', 'k2'}